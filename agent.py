@@ -2,9 +2,10 @@ import json
 import os
 import random
 import datetime
-import google.generativeai as genai
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from distractor_index import load_distractor_index
+from content_pool import load_content_pool, examples_prompt
 load_dotenv()
 
 # --- File Names for our Databases ---
@@ -16,6 +17,12 @@ class VocabAgent:
     def __init__(self):
         """Initializes the agent by loading data files and setting up Gemini."""
         self.word_bank = self._load_word_bank()
+        # Words with several senses appear more than once; like the distractor index, keep the first.
+        self.definitions = {}
+        for w in self.word_bank:
+            self.definitions.setdefault(w['word'], w['definition'])
+        self.distractor_index = load_distractor_index()
+        self.content_pool = load_content_pool()
         self.users = self._load_user_data()
         self.current_user = None
         self.user_progress = None
@@ -55,19 +62,32 @@ class VocabAgent:
 
 
     def _setup_gemini(self):
-        """Sets up the Gemini API with the API key and enables JSON mode."""
+        """
+        Checks the Gemini API key. The client library itself is slow to import,
+        so it is only loaded the first time the `model` property is used.
+        """
         api_key = os.environ.get("GOOGLE_API_KEY")
         if not api_key:
             raise EnvironmentError("GOOGLE_API_KEY environment variable not set.")
-        genai.configure(api_key=api_key)
-        
-        # This is the key change: we tell the model to always output JSON.
-        json_mode_config = genai.GenerationConfig(response_mime_type="application/json")
-        
-        self.model = genai.GenerativeModel(
-            'gemini-1.5-flash-latest',
-            generation_config=json_mode_config
-        )
+        self._api_key = api_key
+        self._model = None
+
+
+    @property
+    def model(self):
+        """Configures Gemini with JSON mode on first use and returns the model."""
+        if self._model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=self._api_key)
+
+            # This is the key change: we tell the model to always output JSON.
+            json_mode_config = genai.GenerationConfig(response_mime_type="application/json")
+
+            self._model = genai.GenerativeModel(
+                'gemini-1.5-flash-latest',
+                generation_config=json_mode_config
+            )
+        return self._model
 
 
     def _load_json(self, filename, default_data):
@@ -184,13 +204,19 @@ class VocabAgent:
 
     def generate_question(self, word):
         """Generates a multiple-choice question for a given word."""
-        correct_definition = next((w['definition'] for w in self.word_bank if w['word'] == word), None)
+        correct_definition = self.definitions.get(word)
         if not correct_definition:
             return None
 
-        distractors = [w['definition'] for w in self.word_bank if w['definition'] != correct_definition]
-        random.shuffle(distractors)
-        options = distractors[:3] + [correct_definition]
+        # Plausible distractors come straight from the precomputed index; only
+        # words missing from it fall back to sampling the whole word bank.
+        distractors = []
+        if self.distractor_index:
+            distractors = [self.definitions.get(n) for n in self.distractor_index.pick_distractors(word)]
+        if len(distractors) < 3 or None in distractors or correct_definition in distractors:
+            candidates = [definition for definition in self.definitions.values() if definition != correct_definition]
+            distractors = random.sample(candidates, 3)
+        options = distractors + [correct_definition]
         random.shuffle(options)
 
         return {
@@ -204,31 +230,23 @@ class VocabAgent:
         """
         Uses Gemini to generate a structured JSON object of example sentences.
         """
-        # 1. Create a highly specific prompt defining the desired JSON structure.
-        prompt = f"""
-        Generate exactly {num_sentences} diverse example sentences for the word '{word}'.
-        
-        Your output MUST be a valid JSON object.
-        The JSON object should have a single key, "examples", which is a list of strings.
-        
-        Example for the word 'happy':
-        {{
-        "examples": [
-            "She was happy to see her friends.",
-            "The happy dog wagged its tail.",
-            "This is a happy occasion."
-        ]
-        }}
-        """
+        # 1. Serve pre-generated sentences when content_pool.py has built them.
+        if self.content_pool:
+            pooled = self.content_pool.examples(word, num_sentences)
+            if pooled:
+                return pooled
+
+        # 2. Otherwise ask for the specific JSON structure defined in the prompt.
+        prompt = examples_prompt(word, num_sentences)
         
         try:
             response = self.model.generate_content(prompt)
             
-            # 2. Use a robust JSON parser with error handling.
+            # 3. Use a robust JSON parser with error handling.
             # The response.text will be a raw JSON string.
             data = json.loads(response.text)
             
-            # 3. Safely extract the data from the parsed dictionary.
+            # 4. Safely extract the data from the parsed dictionary.
             # The .get() method prevents errors if the key is missing.
             sentences = data.get("examples", [])
             
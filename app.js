@@ -8,6 +8,7 @@ const API_BASE_URL = 'https://gre-vocab-backend-apjd.onrender.com';
 let gtCurrentWordId = null;
 let gtScore = 0;
 let gtQuestionsAnswered = 0;
+let gtQuestionShownAt = null;
 
 // --- State for "Fill in the Blank" Quiz ---
 let fibCurrentCorrectAnswer = null;
@@ -161,6 +162,7 @@ async function fetchGtQuestion() {
             button.onclick = () => submitGtAnswer(option, correctAnswer);
             optionsContainer.appendChild(button);
         });
+        gtQuestionShownAt = performance.now();
     } catch (error) {
         wordDisplay.textContent = 'Error';
         feedbackDiv.textContent = error.message;
@@ -169,6 +171,7 @@ async function fetchGtQuestion() {
 
 async function submitGtAnswer(chosenAnswer, correctAnswer) {
     gtQuestionsAnswered++;
+    const latencyMs = gtQuestionShownAt === null ? null : Math.round(performance.now() - gtQuestionShownAt);
     document.querySelectorAll('#options-container button').forEach(b => b.disabled = true);
     if (chosenAnswer === correctAnswer) {
         gtScore++;
@@ -181,7 +184,7 @@ async function submitGtAnswer(chosenAnswer, correctAnswer) {
     await fetch(`${API_BASE_URL}/api/answer`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ user_id: currentUserId, word_id: gtCurrentWordId, answer: chosenAnswer }),
+        body: JSON.stringify({ user_id: currentUserId, word_id: gtCurrentWordId, answer: chosenAnswer, latency_ms: latencyMs }),
     });
     await updateStatsDashboard();
     if (gtQuestionsAnswered < QUIZ_LENGTH) {
@@ -229,20 +232,11 @@ async function handleGenerateSentences() {
     sentencesContainer.innerHTML = '<p>Generating example sentences...</p>';
     generateSentencesButton.disabled = true;
     try {
-        const response = await fetch(`${API_BASE_URL}/api/generate-sentences`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ word: word })
-        });
-        const data = await response.json();
-        if (!response.ok) {
-            throw new Error(data.error || 'An unknown error occurred.');
-        }
-        const sentences = data.examples;
-        if (sentences && sentences.length > 0) {
-            sentencesContainer.innerHTML = '<ul>' + sentences.map(s => `<li>${s}</li>`).join('') + '</ul>';
-        } else {
-            throw new Error("Received an empty list of examples from the server.");
+        // Stream sentences as they are written; fall back to the one-shot request
+        // if the browser or the server does not support streaming.
+        const shown = window.EventSource ? await streamSentences(word) : 0;
+        if (shown === 0) {
+            await fetchSentences(word);
         }
     } catch (error) {
         console.error("Error generating sentences:", error);
@@ -252,6 +246,60 @@ async function handleGenerateSentences() {
     }
 }
 
+// Resolves with the number of sentences shown; 0 means the stream could not be opened.
+function streamSentences(word) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(`${API_BASE_URL}/api/generate-sentences/stream?word=${encodeURIComponent(word)}`);
+        const list = document.createElement('ul');
+        let shown = 0;
+        source.addEventListener('sentence', (event) => {
+            if (shown === 0) {
+                sentencesContainer.innerHTML = '';
+                sentencesContainer.appendChild(list);
+            }
+            const item = document.createElement('li');
+            item.textContent = JSON.parse(event.data).sentence;
+            list.appendChild(item);
+            shown++;
+        });
+        source.addEventListener('done', () => {
+            source.close();
+            if (shown > 0) {
+                resolve(shown);
+            } else {
+                reject(new Error("Received an empty list of examples from the server."));
+            }
+        });
+        source.addEventListener('failed', (event) => {
+            source.close();
+            reject(new Error(JSON.parse(event.data).error));
+        });
+        // Fired when the connection fails or drops; stop EventSource from reconnecting.
+        source.onerror = () => {
+            source.close();
+            resolve(shown);
+        };
+    });
+}
+
+async function fetchSentences(word) {
+    const response = await fetch(`${API_BASE_URL}/api/generate-sentences`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ word: word })
+    });
+    const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.error || 'An unknown error occurred.');
+    }
+    const sentences = data.examples;
+    if (sentences && sentences.length > 0) {
+        sentencesContainer.innerHTML = '<ul>' + sentences.map(s => `<li>${s}</li>`).join('') + '</ul>';
+    } else {
+        throw new Error("Received an empty list of examples from the server.");
+    }
+}
+
 // --- "FILL IN THE BLANK" QUIZ LOGIC ---
 
 function startFibQuiz() {
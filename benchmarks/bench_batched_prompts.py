@@ -0,0 +1,76 @@
+"""
+Compares building example and fill-in-the-blank content one word per call with
+content_pool.py's batched calls, against the stub model.
+
+Reported per mode: model calls, prompt characters and estimated prompt tokens
+(characters / 4), and wall time at --model-latency-ms per call. The per-word
+mode sends the same two prompts the app sends for a word (examples and blanked
+sentence); the batched mode sends one prompt per --batch-size words and
+retries rejected entries one word at a time.
+
+Usage:
+    python benchmarks/bench_batched_prompts.py [--words 200] [--batch-size 20] [--bad-entry-rate 0.05]
+"""
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from content_pool import (examples_prompt, blank_sentence_prompt, generate_content,
+                          GenerationStats, BATCH_SIZE, NUM_EXAMPLES)
+from distractor_index import read_words_from_csv, INPUT_CSV_FILE
+from benchmarks.stub_model import StubModel
+
+
+def run_per_word(words, latency_ms):
+    model = StubModel(latency_ms=latency_ms)
+    prompt_chars = 0
+    start = time.perf_counter()
+    for word in words:
+        for prompt in (examples_prompt(word, NUM_EXAMPLES), blank_sentence_prompt(word)):
+            model.generate_content(prompt)
+            prompt_chars += len(prompt)
+    return {'calls': model.calls, 'prompt_chars': prompt_chars, 'failed': 0,
+            'seconds': time.perf_counter() - start}
+
+
+def run_batched(words, batch_size, latency_ms, bad_entry_rate):
+    model = StubModel(latency_ms=latency_ms, bad_entry_rate=bad_entry_rate)
+    stats = GenerationStats()
+    failed = 0
+    start = time.perf_counter()
+    for _, batch_failed in generate_content(model, words, batch_size, stats=stats):
+        failed += len(batch_failed)
+    return {'calls': stats.calls, 'prompt_chars': stats.prompt_chars, 'failed': failed,
+            'retries': stats.retries, 'seconds': time.perf_counter() - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-word and batched content generation.")
+    parser.add_argument('--words', type=int, default=200, help="Words to generate content for (default: 200).")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f"Words per batched call (default: {BATCH_SIZE}).")
+    parser.add_argument('--bad-entry-rate', type=float, default=0.05,
+                        help="Share of batched entries the stub gets wrong, forcing a retry (default: 0.05).")
+    parser.add_argument('--model-latency-ms', type=float, default=0, help="Simulated latency per call (default: 0).")
+    args = parser.parse_args()
+
+    all_words = [w['word'] for w in read_words_from_csv(os.path.join(ROOT, INPUT_CSV_FILE)) if w['word']]
+    words = list(dict.fromkeys(all_words))[:args.words]
+    per_word = run_per_word(words, args.model_latency_ms)
+    batched = run_batched(words, args.batch_size, args.model_latency_ms, args.bad_entry_rate)
+
+    print(f"Content for {len(words)} words ({NUM_EXAMPLES} examples + 1 blanked sentence each):")
+    print(f"  {'mode':<12}{'calls':>8}{'prompt chars':>14}{'~tokens':>10}{'failed':>8}{'seconds':>9}")
+    for name, result in (('per-word', per_word), ('batched', batched)):
+        print(f"  {name:<12}{result['calls']:>8}{result['prompt_chars']:>14}{result['prompt_chars'] // 4:>10}"
+              f"{result['failed']:>8}{result['seconds']:>9.2f}")
+    print(f"\nBatched: {per_word['calls'] / batched['calls']:.1f}x fewer calls, "
+          f"{per_word['prompt_chars'] / batched['prompt_chars']:.1f}x fewer prompt tokens "
+          f"({batched['retries']} single-word retries).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmarks building the distractor index and picking distractors from it.
+
+Usage:
+    python benchmarks/bench_distractor_index.py [--scale 10] [--lookups 100000]
+
+--scale replicates the Magoosh word list (with suffixed words) to see how the
+build grows as the word bank does.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distractor_index import build_distractor_index, read_words_from_csv, DistractorIndex, INPUT_CSV_FILE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--csv', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), INPUT_CSV_FILE))
+    parser.add_argument('--scale', type=int, default=1, help="Replicate the word list this many times.")
+    parser.add_argument('--lookups', type=int, default=100000, help="Number of distractor lookups to time.")
+    args = parser.parse_args()
+
+    base_words = read_words_from_csv(args.csv)
+    words = [
+        dict(w, word=w['word'] if copy == 0 else f"{w['word']}_{copy}")
+        for copy in range(args.scale)
+        for w in base_words
+    ]
+
+    start = time.perf_counter()
+    index = DistractorIndex(build_distractor_index(words))
+    build_seconds = time.perf_counter() - start
+
+    indexed_words = list(index.words)
+    lookup_words = [random.choice(indexed_words) for _ in range(args.lookups)]
+    start = time.perf_counter()
+    for word in lookup_words:
+        index.pick_distractor_definitions(word)
+    lookup_seconds = time.perf_counter() - start
+
+    print(f"Words indexed:        {len(index)}")
+    print(f"Build time:           {build_seconds:.3f} s")
+    print(f"Lookups:              {args.lookups}")
+    print(f"Mean lookup latency:  {lookup_seconds / args.lookups * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Benchmarks the leaderboard reads and the per-answer aggregate update at scale.
+
+Seeds the benchmark database used by quiz_load.py with synthetic users
+(100k by default) that have leaderboard stats but no user_progress rows,
+rebuilds the score counts from those stats, then times with a warm cache:
+    top_mastered / top_streak   global top-N (leaderboard.get_top)
+    top_cohort                  one cohort's top-N
+    rank_global / rank_cohort   a random user's rank (leaderboard.get_rank)
+    rank_naive                  the same rank computed with COUNT(*) over user_stats,
+                                what a rank costs without leaderboard_score_counts
+    record_answer               leaderboard.record_answer + commit, moving the user
+                                across the mastered threshold every time; the
+                                touched users' stats and the score counts are
+                                restored afterwards, so runs stay comparable
+
+Usage (same BENCH_DB_* settings as quiz_load.py):
+    BENCH_DB_PW=bench python benchmarks/bench_leaderboard.py [--users 100000] [--iterations 500]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import mysql.connector
+
+import leaderboard
+from migrate_to_mysql import create_tables
+from benchmarks.quiz_load import BENCH_DB, BENCH_DB_NAME, RESULTS_DIR, SEED_BATCH_SIZE, percentile, git_commit
+
+# --- Configuration ---
+LEADERBOARD_USER_PREFIX = 'lb_user_'
+
+
+def seed_users(conn, num_users, num_cohorts, rng):
+    """Tops up synthetic users with stats rows and rebuilds the score counts."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COUNT(*) FROM users WHERE username LIKE %s", (LEADERBOARD_USER_PREFIX + '%',))
+        existing_users = cursor.fetchone()[0]
+        if existing_users < num_users:
+            print(f"Seeding {num_users - existing_users} leaderboard users...")
+            for start in range(existing_users, num_users, SEED_BATCH_SIZE):
+                end = min(start + SEED_BATCH_SIZE, num_users)
+                cursor.executemany("INSERT IGNORE INTO users (username) VALUES (%s)",
+                                   [(f"{LEADERBOARD_USER_PREFIX}{i}",) for i in range(start, end)])
+                cursor.execute("SELECT id FROM users WHERE username LIKE %s ORDER BY id DESC LIMIT %s",
+                               (LEADERBOARD_USER_PREFIX + '%', end - start))
+                rows = []
+                for (user_id,) in cursor.fetchall():
+                    # Most learners master a few words; a long tail masters most of the list.
+                    mastered = int(rng.betavariate(1.2, 6) * 1000)
+                    best_streak = int(rng.expovariate(1 / 15))
+                    cohort = f"cohort_{rng.randrange(num_cohorts)}" if rng.random() < 0.8 else ''
+                    rows.append((user_id, cohort, mastered, rng.randint(0, best_streak), best_streak))
+                cursor.executemany("""
+                    INSERT IGNORE INTO user_stats (user_id, cohort, words_mastered, current_streak, best_streak, updated_at)
+                    VALUES (%s, %s, %s, %s, %s, UTC_TIMESTAMP())
+                """, rows)
+                conn.commit()
+        print("Rebuilding score counts...")
+        leaderboard.rebuild_leaderboard(conn, recount_mastered=False)
+
+        cursor.execute("""
+            SELECT s.user_id, s.cohort FROM user_stats s JOIN users u ON u.id = s.user_id
+            WHERE u.username LIKE %s
+        """, (LEADERBOARD_USER_PREFIX + '%',))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def snapshot_stats(cursor, user_ids):
+    cursor.execute(f"""
+        SELECT user_id, words_mastered, current_streak, best_streak FROM user_stats
+        WHERE user_id IN ({', '.join(['%s'] * len(user_ids))})
+    """, tuple(user_ids))
+    return cursor.fetchall()
+
+
+def restore_stats(conn, cursor, saved_stats):
+    """Puts back the rows from snapshot_stats() and rebuilds the score counts to match."""
+    cursor.executemany(
+        "UPDATE user_stats SET words_mastered = %s, current_streak = %s, best_streak = %s WHERE user_id = %s",
+        [(row['words_mastered'], row['current_streak'], row['best_streak'], row['user_id']) for row in saved_stats])
+    conn.commit()
+    leaderboard.rebuild_leaderboard(conn, recount_mastered=False)
+
+
+def time_operation(iterations, operation):
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        'mean': sum(latencies) / len(latencies) * 1000,
+        'p50': percentile(latencies, 0.50) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'max': latencies[-1] * 1000,
+    }
+
+
+def explain_key(cursor, query, params):
+    cursor.execute(f"EXPLAIN {query}", params)
+    return [row['key'] for row in cursor.fetchall()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark leaderboard top-N, rank and update cost.")
+    parser.add_argument('--users', type=int, default=100000, help="Synthetic users to seed (default: 100000).")
+    parser.add_argument('--cohorts', type=int, default=200, help="Cohorts to spread users over (default: 200).")
+    parser.add_argument('--iterations', type=int, default=500, help="Timed calls per operation (default: 500).")
+    parser.add_argument('--limit', type=int, default=10, help="Top-N size (default: 10).")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/leaderboard-<timestamp>.json).")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    conn = mysql.connector.connect(**BENCH_DB)
+    setup_cursor = conn.cursor()
+    setup_cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{BENCH_DB_NAME}`")
+    setup_cursor.execute(f"USE `{BENCH_DB_NAME}`")
+    create_tables(setup_cursor)
+    setup_cursor.close()
+
+    users = seed_users(conn, args.users, args.cohorts, rng)
+    cohort_users = [(user_id, cohort) for user_id, cohort in users if cohort]
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT COUNT(*) AS users FROM user_stats")
+    board_size = cursor.fetchone()['users']
+    conn.commit()
+
+    def cohort_rank(i):
+        user_id, cohort = rng.choice(cohort_users)
+        leaderboard.get_rank(cursor, user_id, 'mastered', cohort)
+
+    def naive_rank(i):
+        user_id = rng.choice(users)[0]
+        cursor.execute("SELECT words_mastered FROM user_stats WHERE user_id = %s", (user_id,))
+        score = cursor.fetchone()['words_mastered']
+        cursor.execute("SELECT COUNT(*) + 1 AS `rank` FROM user_stats WHERE words_mastered > %s", (score,))
+        cursor.fetchone()
+
+    # Picked up front so their stats can be put back once the timing is done.
+    update_users = [rng.choice(users)[0] for _ in range(args.iterations + 1)]
+    saved_stats = snapshot_stats(cursor, set(update_users))
+
+    def update(i):
+        user_id = update_users[i]
+        # Alternate crossing the threshold up and down so score buckets always move.
+        if i % 2 == 0:
+            leaderboard.record_answer(cursor, user_id, leaderboard.MASTERED_LEVEL - 1, leaderboard.MASTERED_LEVEL, True)
+        else:
+            leaderboard.record_answer(cursor, user_id, leaderboard.MASTERED_LEVEL, leaderboard.MASTERED_LEVEL - 1, False)
+        conn.commit()
+
+    operations = {
+        'top_mastered': lambda i: leaderboard.get_top(cursor, 'mastered', None, args.limit),
+        'top_streak': lambda i: leaderboard.get_top(cursor, 'streak', None, args.limit),
+        'top_cohort': lambda i: leaderboard.get_top(cursor, 'mastered', f"cohort_{i % args.cohorts}", args.limit),
+        'rank_global': lambda i: leaderboard.get_rank(cursor, rng.choice(users)[0], 'mastered'),
+        'rank_cohort': cohort_rank,
+        'rank_naive': naive_rank,
+        'record_answer': update,
+    }
+
+    print(f"\n{board_size} users on the global board, {args.iterations} calls per operation (ms):")
+    print(f"  {'operation':<16}{'mean':>9}{'p50':>9}{'p99':>9}{'max':>9}")
+    timings = {}
+    try:
+        for name, operation in operations.items():
+            operation(0)  # warm up
+            timings[name] = time_operation(args.iterations, operation)
+            t = timings[name]
+            print(f"  {name:<16}{t['mean']:>9.2f}{t['p50']:>9.2f}{t['p99']:>9.2f}{t['max']:>9.2f}")
+    finally:
+        print("Restoring the stats changed by record_answer...")
+        conn.rollback()
+        restore_stats(conn, cursor, saved_stats)
+
+    top_query = "SELECT user_id FROM user_stats ORDER BY words_mastered DESC, user_id DESC LIMIT 10"
+    cohort_query = "SELECT user_id FROM user_stats WHERE cohort = %s ORDER BY words_mastered DESC, user_id DESC LIMIT 10"
+    plans = {
+        'top_mastered': explain_key(cursor, top_query, ()),
+        'top_cohort': explain_key(cursor, cohort_query, ('cohort_0',)),
+    }
+    print(f"\nIndexes used: {plans}")
+    cursor.close()
+    conn.close()
+
+    result = {
+        'benchmark': 'leaderboard',
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git_commit': git_commit(),
+        'config': dict(vars(args), board_size=board_size),
+        'latency_ms': timings,
+        'plans': plans,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"leaderboard-{datetime.now().strftime('%Y%m%dT%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    print(f"\nSaved results to '{output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measures cold-start cost: importing app.py / agent.py and serving the first requests.
+
+Each run happens in a fresh interpreter so nothing is already imported.
+Reported per run (median over --runs):
+    process_s        wall time of the whole child process
+    import_app_s     `import app`
+    first_health_s   first GET /health after import
+    first_index_s    first GET /
+    get_model_s      first app.get_model() (Gemini import + configure, no network)
+    import_agent_s   `import agent`
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--output startup.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = r"""
+import json, os, sys, time, warnings
+warnings.simplefilter('ignore')
+os.environ.setdefault('GOOGLE_API_KEY', 'benchmark-placeholder-key')
+timings = {}
+
+start = time.perf_counter()
+import app
+timings['import_app_s'] = time.perf_counter() - start
+
+client = app.app.test_client()
+start = time.perf_counter()
+client.get('/health')
+timings['first_health_s'] = time.perf_counter() - start
+
+start = time.perf_counter()
+client.get('/')
+timings['first_index_s'] = time.perf_counter() - start
+
+start = time.perf_counter()
+app.get_model()
+timings['get_model_s'] = time.perf_counter() - start
+
+start = time.perf_counter()
+import agent
+timings['import_agent_s'] = time.perf_counter() - start
+
+sys.__stdout__.write('TIMINGS ' + json.dumps(timings) + '\n')
+"""
+
+
+def run_once():
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', CHILD_SCRIPT], cwd=ROOT,
+                               capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    line = next(l for l in completed.stdout.splitlines() if l.startswith('TIMINGS '))
+    timings = json.loads(line[len('TIMINGS '):])
+    timings['process_s'] = elapsed
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time and first-request latency.")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters to start (default: 5).")
+    parser.add_argument('--output', help="Optional JSON file for the results.")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    summary = {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+
+    print(f"Median over {args.runs} fresh interpreters:")
+    for name in ('process_s', 'import_app_s', 'first_health_s', 'first_index_s', 'get_model_s', 'import_agent_s'):
+        print(f"  {name:<16}{summary[name] * 1000:>9.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'benchmark': 'startup', 'runs': runs, 'median': summary}, f, indent=2)
+        print(f"Saved results to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compares time to first sentence for /api/generate-sentences and its SSE variant.
+
+Both routes run in-process against the stub model with the same simulated
+latency. The stub streams its reply in small chunks spread over that latency,
+so the streaming route can send the first sentence after roughly a third of it,
+while the JSON route answers only once the whole reply is in.
+
+Reported per route (median over --requests):
+    first_sentence_ms   until the first sentence reaches the client
+    complete_ms         until the response is complete
+
+Usage:
+    python benchmarks/bench_streaming.py [--model-latency-ms 1500] [--requests 10]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_model import StubModel
+
+
+def time_json(client, word):
+    start = time.perf_counter()
+    response = client.post('/api/generate-sentences', json={'word': word})
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200 and response.get_json()['examples'], response.data
+    return elapsed, elapsed
+
+
+def time_stream(client, word):
+    start = time.perf_counter()
+    response = client.get('/api/generate-sentences/stream', query_string={'word': word}, buffered=False)
+    first_sentence = None
+    body = b''
+    for data in response.response:
+        body += data
+        if first_sentence is None and b'event: sentence' in body:
+            first_sentence = time.perf_counter() - start
+    complete = time.perf_counter() - start
+    response.close()
+    assert body.count(b'event: sentence') == 3 and b'event: done' in body, body
+    return first_sentence, complete
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first sentence, JSON vs streaming.")
+    parser.add_argument('--model-latency-ms', type=float, default=1500, help="Simulated Gemini latency (default: 1500).")
+    parser.add_argument('--requests', type=int, default=10, help="Requests per route (default: 10).")
+    args = parser.parse_args()
+
+    os.environ.setdefault('GOOGLE_API_KEY', 'benchmark-placeholder-key')
+    import app
+    app.model = StubModel(latency_ms=args.model_latency_ms)
+    # Pooled sentences would skip the model entirely.
+    app.content_pool = None
+    client = app.app.test_client()
+
+    print(f"Median over {args.requests} requests, model latency {args.model_latency_ms:.0f} ms:")
+    print(f"  {'route':<34}{'first_sentence_ms':>18}{'complete_ms':>13}")
+    for route, measure in (('POST /api/generate-sentences', time_json), ('GET /api/generate-sentences/stream', time_stream)):
+        runs = [measure(client, 'laconic') for _ in range(args.requests)]
+        first = statistics.median(run[0] for run in runs) * 1000
+        complete = statistics.median(run[1] for run in runs) * 1000
+        print(f"  {route:<34}{first:>18.1f}{complete:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compares two benchmark result files written by benchmarks/quiz_load.py.
+
+Usage:
+    python benchmarks/compare_results.py baseline.json candidate.json
+"""
+import sys
+import json
+
+
+def _change(old, new):
+    if not old:
+        return ''
+    return f"{(new - old) / old:+.1%}"
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__.strip())
+        sys.exit(1)
+    with open(sys.argv[1], encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(sys.argv[2], encoding='utf-8') as f:
+        candidate = json.load(f)
+
+    print(f"baseline:  {sys.argv[1]} ({baseline.get('git_commit')})")
+    print(f"candidate: {sys.argv[2]} ({candidate.get('git_commit')})\n")
+    for label, result in (('baseline', baseline), ('candidate', candidate)):
+        if result.get('config', {}).get('keep_db', True):
+            print(f"Warning: the {label} ran on a reused database (--keep-db or an older run); "
+                  f"the two runs may not have measured the same data.\n")
+    for name in ('throughput_rps', 'db_queries_per_request', 'errors'):
+        old, new = baseline['totals'][name], candidate['totals'][name]
+        print(f"{name:<26}{old:>10.2f} -> {new:>10.2f}  {_change(old, new)}")
+
+    print(f"\n{'route':<38}{'p50 ms':>22}{'p99 ms':>22}{'q/req':>16}")
+    for route in sorted(set(baseline['routes']) | set(candidate['routes'])):
+        old, new = baseline['routes'].get(route), candidate['routes'].get(route)
+        if not old or not new:
+            print(f"{route:<38}  only in {'candidate' if new else 'baseline'}")
+            continue
+        cells = []
+        for old_value, new_value in ((old['latency_ms']['p50'], new['latency_ms']['p50']),
+                                     (old['latency_ms']['p99'], new['latency_ms']['p99'])):
+            cells.append(f"{old_value:.1f}->{new_value:.1f} {_change(old_value, new_value):>7}")
+        cells.append(f"{old['db_queries_per_request']:.1f}->{new['db_queries_per_request']:.1f}")
+        print(f"{route:<38}{cells[0]:>22}{cells[1]:>22}{cells[2]:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+A stand-in for the Gemini GenerativeModel used by app.py and agent.py.
+
+It answers the app's prompts with well-formed JSON after a configurable delay,
+so benchmarks measure our own code and database rather than the Gemini API.
+Batched prompts from content_pool.py get one item per word; `bad_entry_rate`
+makes that share of items leave the word in the blanked sentence, which the
+pool builder must reject and retry.
+
+With stream=True (and a text/plain generation_config, as the SSE route sends)
+the reply is plain lines delivered in small chunks spread over the latency,
+the way Gemini streams, instead of all at once at the end.
+"""
+import re
+import json
+import time
+import random
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    def __init__(self, latency_ms=0, bad_entry_rate=0.0, seed=0):
+        self.latency = latency_ms / 1000.0
+        self.bad_entry_rate = bad_entry_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def _word(self, prompt):
+        match = re.search(r"word(?: is)?:? \**'([^']+)'", prompt) or re.search(r"'([^']+)'", prompt)
+        return match.group(1) if match else "word"
+
+    def _examples(self, word):
+        return [
+            f"The critic called the play {word}.",
+            f"Few people expected the result to be so {word}.",
+            f"It is hard to describe {word} ideas briefly.",
+        ]
+
+    def _reply(self, prompt, generation_config):
+        batch = re.search(r"^Words: (\[.*\])$", prompt, re.MULTILINE)
+        if batch:
+            return json.dumps({"items": [self._item(word) for word in json.loads(batch.group(1))]})
+        word = self._word(prompt)
+        if generation_config.get('response_mime_type') == 'text/plain':
+            return '\n'.join(self._examples(word))
+        if '_____' in prompt:
+            return json.dumps({"sentence": "Her remarks were so _____ that nobody could follow them."})
+        return json.dumps({"examples": self._examples(word)})
+
+    def generate_content(self, prompt, stream=False, generation_config=None, **kwargs):
+        self.calls += 1
+        text = self._reply(prompt, generation_config or {})
+        if stream:
+            return self._stream(text)
+        if self.latency:
+            time.sleep(self.latency)
+        return StubResponse(text)
+
+    def _stream(self, text, chunk_chars=16):
+        chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)]
+        for chunk in chunks:
+            if self.latency:
+                time.sleep(self.latency / len(chunks))
+            yield StubResponse(chunk)
+
+    def _item(self, word):
+        blanked = "Her remarks were so _____ that nobody could follow them."
+        if self._rng.random() < self.bad_entry_rate:
+            blanked = f"Her remarks were so {word} that nobody could follow them."
+        return {
+            "word": word,
+            "examples": self._examples(word),
+            "blank_sentence": blanked,
+        }
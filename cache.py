@@ -0,0 +1,335 @@
+"""
+Shared cache tier for the web app.
+
+Two backends with the same interface:
+  LocalCache  in-process only; the default when CACHE_URL is unset.
+  RedisCache  shared by every gunicorn worker and Render instance
+              (CACHE_URL=redis://host:6379/0). Needs the `redis` package.
+
+Keys look like "<namespace>:<name>", e.g. "words:all" or "users:alice".
+invalidate(namespace) drops every key in a namespace on every process:
+RedisCache bumps a version number that is part of the stored key and
+publishes the change, so each process also clears its in-memory copy.
+
+get_or_set() loads a missing value once: concurrent callers in a process
+wait for the first loader, and with Redis a short lock makes other
+processes wait for the value instead of all querying MySQL after a restart.
+
+If Redis cannot be reached, RedisCache treats reads as misses and keeps
+only its in-process copy, so callers fall back to MySQL. failed_within()
+tells callers that shared state (such as recent-write flags) may be missing.
+
+Usage from the command line:
+    python cache.py invalidate words     # after changing the words table (needs CACHE_URL
+                                         # to reach running apps; see main())
+    python cache.py selftest             # exercise the configured backend
+"""
+import os
+import sys
+import json
+import time
+import threading
+
+# Values are reloaded at least this often even without an invalidation.
+CACHE_TTL_SECONDS = int(os.environ.get('CACHE_TTL_SECONDS', 3600))
+# RedisCache keeps a per-process copy of hot values for this long.
+LOCAL_TTL_SECONDS = float(os.environ.get('CACHE_LOCAL_TTL_SECONDS', 30))
+KEY_PREFIX = 'gre-vocab'
+INVALIDATION_CHANNEL = f'{KEY_PREFIX}:invalidate'
+# How long another process may hold the load lock before we load ourselves.
+LOAD_LOCK_SECONDS = 5.0
+LOAD_POLL_SECONDS = 0.05
+# While Redis keeps failing, log at most one warning per this many seconds.
+ERROR_LOG_INTERVAL_SECONDS = 60
+
+
+def _namespace(key):
+    return key.split(':', 1)[0]
+
+
+class LocalCache:
+    """Thread-safe in-process cache with per-key expiry."""
+
+    def __init__(self, default_ttl=CACHE_TTL_SECONDS):
+        self.default_ttl = default_ttl
+        self.stats = {'hits': 0, 'misses': 0, 'loads': 0}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.stats['hits'] += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            self._entries[key] = (value, expires)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, namespace):
+        prefix = namespace + ':'
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def failed_within(self, seconds):
+        return False
+
+    def _load_lock(self, key):
+        with self._lock:
+            return self._load_locks.setdefault(key, threading.Lock())
+
+    def get_or_set(self, key, loader, ttl=None):
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._load_lock(key):
+            # Another thread may have loaded it while we waited.
+            value = self.get(key)
+            if value is None:
+                value = loader()
+                self.stats['loads'] += 1
+                if value is not None:
+                    self.set(key, value, ttl)
+            return value
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache:
+    """Redis-backed cache with an in-process copy kept coherent by pub/sub."""
+
+    def __init__(self, url, default_ttl=CACHE_TTL_SECONDS, local_ttl=LOCAL_TTL_SECONDS):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("CACHE_URL is set but the 'redis' package is not installed. Run 'pip install redis'.")
+        self.url = url
+        self.default_ttl = default_ttl
+        self.redis = redis.Redis.from_url(url)
+        self.redis_errors = redis.RedisError
+        self.local = LocalCache(default_ttl=local_ttl)
+        self.stats = {'hits': 0, 'misses': 0, 'loads': 0}
+        self._versions = {}
+        self._local_pid = os.getpid()
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+        self._last_error = None
+
+    # --- Errors ---
+    def _redis_failed(self, error):
+        now = time.monotonic()
+        if self._last_error is None or now - self._last_error > ERROR_LOG_INTERVAL_SECONDS:
+            print(f"Warning: Redis cache unavailable ({error}); using this process's copy and MySQL.")
+        self._last_error = now
+
+    def failed_within(self, seconds):
+        """True if a Redis call failed in the last `seconds`, so shared keys may be missing."""
+        return self._last_error is not None and time.monotonic() - self._last_error < seconds
+
+    # --- Invalidation ---
+    def _ensure_listener(self):
+        """Starts the pub/sub listener in this process (again after a fork)."""
+        if self._listener_pid == os.getpid():
+            return
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            if self._local_pid != os.getpid():
+                # Anything cached before the fork may already be stale.
+                self.local = LocalCache(default_ttl=self.local.default_ttl)
+                self._versions = {}
+                self._local_pid = os.getpid()
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_invalidation})
+                pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            except self.redis_errors as e:
+                # Retried on the next call; until then the version re-read in _version() applies.
+                self._redis_failed(e)
+                return
+            self._listener_pid = os.getpid()
+
+    def _on_invalidation(self, message):
+        namespace = message['data'].decode('utf-8')
+        self._versions.pop(namespace, None)
+        self.local.invalidate(namespace)
+
+    def _version(self, namespace):
+        """The namespace's current version, remembered locally until the next invalidation."""
+        cached = self._versions.get(namespace)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        version = int(self.redis.get(f'{KEY_PREFIX}:version:{namespace}') or 0)
+        # Re-read now and then in case an invalidation message was missed.
+        self._versions[namespace] = (version, time.monotonic() + self.local.default_ttl)
+        return version
+
+    def _redis_key(self, key):
+        namespace = _namespace(key)
+        return f'{KEY_PREFIX}:{namespace}:v{self._version(namespace)}:{key.split(":", 1)[-1]}'
+
+    def invalidate(self, namespace):
+        self.redis.incr(f'{KEY_PREFIX}:version:{namespace}')
+        self.redis.publish(INVALIDATION_CHANNEL, namespace)
+        self._on_invalidation({'data': namespace.encode('utf-8')})
+
+    # --- Reads and writes ---
+    def get(self, key):
+        self._ensure_listener()
+        value = self.local.get(key)
+        if value is not None:
+            self.stats['hits'] += 1
+            return value
+        try:
+            raw = self.redis.get(self._redis_key(key))
+        except self.redis_errors as e:
+            self._redis_failed(e)
+            raw = None
+        if raw is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self._ensure_listener()
+        self.local.set(key, value, min(ttl or self.default_ttl, self.local.default_ttl))
+        try:
+            self.redis.set(self._redis_key(key), json.dumps(value), ex=ttl or self.default_ttl)
+        except self.redis_errors as e:
+            self._redis_failed(e)
+
+    def delete(self, key):
+        self._ensure_listener()
+        self.local.delete(key)
+        try:
+            self.redis.delete(self._redis_key(key))
+        except self.redis_errors as e:
+            self._redis_failed(e)
+
+    def get_or_set(self, key, loader, ttl=None):
+        value = self.get(key)
+        if value is not None:
+            return value
+        # One thread per process asks Redis; the rest wait on it.
+        return self.local.get_or_set(key, lambda: self._load_shared(key, loader, ttl), ttl=self.local.default_ttl)
+
+    def _load_shared(self, key, loader, ttl):
+        try:
+            redis_key = self._redis_key(key)
+            lock_key = f'{redis_key}:loading'
+            deadline = time.monotonic() + LOAD_LOCK_SECONDS
+            while not self.redis.set(lock_key, os.getpid(), nx=True, px=int(LOAD_LOCK_SECONDS * 1000)):
+                # Another process is loading; use its result once it lands.
+                raw = self.redis.get(redis_key)
+                if raw is not None:
+                    self.stats['hits'] += 1
+                    return json.loads(raw)
+                if time.monotonic() > deadline:
+                    break
+                time.sleep(LOAD_POLL_SECONDS)
+        except self.redis_errors as e:
+            # Without Redis each process loads for itself.
+            self._redis_failed(e)
+            self.stats['loads'] += 1
+            return loader()
+        try:
+            value = loader()
+            self.stats['loads'] += 1
+            if value is not None:
+                self.redis.set(redis_key, json.dumps(value), ex=ttl or self.default_ttl)
+            return value
+        except self.redis_errors as e:
+            self._redis_failed(e)
+            return value
+        finally:
+            try:
+                self.redis.delete(lock_key)
+            except self.redis_errors as e:
+                self._redis_failed(e)
+
+    def __len__(self):
+        return len(self.local)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Returns the process-wide cache for $CACHE_URL (a LocalCache when it is unset)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                url = os.environ.get('CACHE_URL')
+                _cache = RedisCache(url) if url else LocalCache()
+    return _cache
+
+
+def _selftest():
+    cache = get_cache()
+    print(f"Testing {type(cache).__name__} ({getattr(cache, 'url', 'in-process')})...")
+    cache.set('selftest:value', {'answer': 42}, ttl=60)
+    assert cache.get('selftest:value') == {'answer': 42}
+
+    calls = []
+    def loader():
+        calls.append(1)
+        return ['loaded']
+    threads = [threading.Thread(target=cache.get_or_set, args=('selftest:herd', loader)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1, f"loader ran {len(calls)} times"
+
+    cache.invalidate('selftest')
+    assert cache.get('selftest:value') is None
+    if isinstance(cache, RedisCache):
+        # A second instance stands in for another worker holding a local copy.
+        other = RedisCache(cache.url)
+        other.set('selftest:shared', 'old', ttl=60)
+        assert cache.get('selftest:shared') == 'old'
+        other.invalidate('selftest')
+        time.sleep(1.5)
+        assert cache.get('selftest:shared') is None, "invalidation was not broadcast"
+    print("OK")
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == 'invalidate':
+        cache = get_cache()
+        cache.invalidate(sys.argv[2])
+        if isinstance(cache, LocalCache):
+            # A LocalCache lives inside each app process, out of reach of this command.
+            print(f"CACHE_URL is not set, so running app processes were not told. "
+                  f"They reload '{sys.argv[2]}' within {CACHE_TTL_SECONDS} s, or restart them now.")
+        else:
+            print(f"Invalidated '{sys.argv[2]}'.")
+    elif len(sys.argv) == 2 and sys.argv[1] == 'selftest':
+        _selftest()
+    else:
+        print(__doc__.strip())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    main()
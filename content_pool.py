@@ -0,0 +1,303 @@
+import os
+import re
+import json
+import time
+import random
+import argparse
+from dotenv import load_dotenv
+from distractor_index import read_words_from_csv, read_words_from_db, INPUT_CSV_FILE
+from instrumentation import call_model
+
+# --- Configuration ---
+CONTENT_POOL_FILE = os.environ.get('CONTENT_POOL_FILE', 'content_pool.json')
+# Words per batched call. Larger batches save more prompt tokens but a single bad
+# response then costs more retries; 20 keeps the reply well under the output limit.
+BATCH_SIZE = 20
+NUM_EXAMPLES = 3
+BLANK = '_____'
+POOL_VERSION = 1
+# A run of three or more underscores is treated as the blank.
+BLANK_PATTERN = re.compile(r'_{3,}')
+
+
+# --- Prompts ---
+def examples_prompt(word, num_sentences=NUM_EXAMPLES):
+    """The single-word example sentence prompt used by /api/generate-sentences and agent.py."""
+    return f"""
+    Generate exactly {num_sentences} diverse unique example sentences for the word '{word}'.
+    Your output MUST be a valid JSON object.
+    The JSON object should have a single key, "examples", which is a list of strings.
+    Example for the word 'happy':
+    {{
+    "examples": [
+        "She was happy to see her friends.",
+        "The happy dog wagged its tail.",
+        "This is a happy occasion."
+    ]
+    }}
+    """
+
+
+def streaming_examples_prompt(word, num_sentences=NUM_EXAMPLES):
+    """Plain-text variant of examples_prompt, one sentence per line so each can be sent as soon as it ends."""
+    return f"""Generate exactly {num_sentences} diverse unique example sentences for the word '{word}'.
+Write each sentence on its own line, with no numbering, bullets, quotes or any other text."""
+
+
+def blank_sentence_prompt(word):
+    """The single-word fill-in-the-blank prompt used by /api/fill-in-the-blank-question."""
+    return f"""
+Your task is to create a fill-in-the-blank sentence quiz question.
+
+**Follow these steps precisely:**
+
+1.  **Analyze the Word:** The word to create a sentence for is: **'{word}'**.
+2.  **Create a Contextual Sentence:** First, write a clear, high-quality sentence that uses the word '{word}' in a way that its meaning can be understood from the context.
+3.  **Replace the Word:** In the sentence you just created, you MUST replace the exact word '{word}' with the placeholder '_____' (five underscores). Do not include the original word in the final sentence.
+4.  **Format the Output:** Your final output MUST be a single, valid JSON object. This object must contain one key, "sentence", whose value is the sentence with the '_____' placeholder.
+
+**Example Task:**
+* Word: 'ephemeral'
+* Sentence created in step 2: "The beauty of the cherry blossoms is ephemeral, lasting only for a few days each spring."
+* Sentence after step 3: "The beauty of the cherry blossoms is _____, lasting only for a few days each spring."
+
+**Final JSON Output for the example:**
+```json
+{{
+    "sentence": "The beauty of the cherry blossoms is _____, lasting only for a few days each spring."
+}}
+```
+
+**Now, perform the task for the word: '{word}'**
+"""
+
+
+def batch_prompt(words, num_examples=NUM_EXAMPLES):
+    """One prompt asking for example sentences and a blanked sentence for every word."""
+    return f"""For each word in the list, write {num_examples} diverse example sentences that use the word, and one more sentence whose context makes the word's meaning clear, with the word replaced by '{BLANK}' (five underscores).
+Return a JSON object: {{"items": [{{"word": "<word>", "examples": ["<sentence>", ...], "blank_sentence": "<sentence with {BLANK}>"}}, ...]}} with one item per word, in the same order.
+Words: {json.dumps(list(words))}"""
+
+
+# --- Validation ---
+INFLECTIONS = r'(?:s|es|ed|d|ing|ly|ally|er|est)?'
+
+def _word_pattern(word):
+    """
+    Matches the word and its inflections ("abate" also matches "abated",
+    "abating"; "abet" matches "abetted") but not longer words that merely
+    start with it ("gall" does not match "gallery").
+    """
+    lower = word.lower()
+    forms = [re.escape(word) + INFLECTIONS]
+    if len(lower) > 2 and lower.endswith('e'):
+        forms.append(re.escape(word[:-1]) + r'(?:ing|ed|er|est)')
+    if len(lower) > 2 and lower.endswith('y') and lower[-2] not in 'aeiou':
+        forms.append(re.escape(word[:-1]) + r'i(?:es|ed|er|est|ly|ness)')
+    if (len(lower) > 2 and lower[-1] not in 'aeiouwxy' and lower[-2] in 'aeiou'
+            and lower[-3] not in 'aeiou'):
+        forms.append(re.escape(word + word[-1]) + r'(?:ed|ing|er|est)')
+    return re.compile(r'\b(?:' + '|'.join(forms) + r')\b', re.IGNORECASE)
+
+
+def validate_entry(word, entry, num_examples=NUM_EXAMPLES):
+    """
+    Returns {"examples": [...], "sentences": [...]} for a well-formed entry, or None.
+    Every example must use the word, and the blanked sentence must contain exactly one
+    blank and no other form of the word.
+    """
+    if not isinstance(entry, dict):
+        return None
+    pattern = _word_pattern(word)
+    examples = entry.get('examples')
+    if not isinstance(examples, list):
+        return None
+    examples = [e.strip() for e in examples if isinstance(e, str) and pattern.search(e)]
+    if len(examples) < num_examples:
+        return None
+
+    sentence = entry.get('blank_sentence')
+    if not isinstance(sentence, str):
+        return None
+    sentence = BLANK_PATTERN.sub(BLANK, sentence.strip())
+    if sentence.count(BLANK) != 1 or pattern.search(sentence):
+        return None
+    return {"examples": examples[:num_examples], "sentences": [sentence]}
+
+
+# --- Generation ---
+class GenerationStats:
+    def __init__(self):
+        self.calls = 0
+        self.prompt_chars = 0
+        self.prompt_tokens = 0
+        self.retries = 0
+
+    def record(self, prompt, response):
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        usage = getattr(response, 'usage_metadata', None)
+        self.prompt_tokens += getattr(usage, 'prompt_token_count', 0) or 0
+
+
+def generate_batch(model, words, num_examples=NUM_EXAMPLES, stats=None):
+    """
+    Generates content for `words` in one JSON-mode call.
+    Returns ({word: entry} for the entries that validated, [words that did not]).
+    """
+    prompt = batch_prompt(words, num_examples)
+    try:
+        response = call_model(model, prompt)
+    except Exception as e:
+        print(f"Error communicating with Gemini for {len(words)} words: {e}")
+        return {}, list(words)
+    if stats is not None:
+        stats.record(prompt, response)
+
+    try:
+        items = json.loads(response.text).get('items', [])
+    except (json.JSONDecodeError, AttributeError) as e:
+        print(f"Error parsing batched response for {len(words)} words: {e}")
+        return {}, list(words)
+
+    by_word = {}
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, dict) and isinstance(item.get('word'), str):
+            by_word.setdefault(item['word'].strip().lower(), item)
+
+    entries, failed = {}, []
+    for word in words:
+        entry = validate_entry(word, by_word.get(word.lower()), num_examples)
+        if entry:
+            entries[word] = entry
+        else:
+            failed.append(word)
+    return entries, failed
+
+
+def generate_content(model, words, batch_size=BATCH_SIZE, num_examples=NUM_EXAMPLES, retries=2, stats=None):
+    """
+    Yields (entries, failed_words) for each batch of `words`. Words whose entry
+    fails validation are retried on their own up to `retries` times.
+    """
+    # The word list repeats words that have several senses; one entry serves them all.
+    words = list(dict.fromkeys(words))
+    for start in range(0, len(words), batch_size):
+        entries, failed = generate_batch(model, words[start:start + batch_size], num_examples, stats)
+        still_failed = []
+        for word in failed:
+            for _ in range(retries):
+                if stats is not None:
+                    stats.retries += 1
+                retried, _ = generate_batch(model, [word], num_examples, stats)
+                if word in retried:
+                    entries.update(retried)
+                    break
+            else:
+                still_failed.append(word)
+        yield entries, still_failed
+
+
+# --- Loading ---
+class ContentPool:
+    """Pre-generated example and fill-in-the-blank sentences, keyed by word."""
+
+    def __init__(self, data):
+        self.words = data['words']
+
+    def examples(self, word, count=NUM_EXAMPLES):
+        examples = self.words.get(word, {}).get('examples', [])
+        if len(examples) < count:
+            return None
+        return random.sample(examples, count)
+
+    def blank_sentence(self, word):
+        sentences = self.words.get(word, {}).get('sentences')
+        return random.choice(sentences) if sentences else None
+
+    def __len__(self):
+        return len(self.words)
+
+
+def load_content_pool(path=CONTENT_POOL_FILE):
+    """Loads the pool built by this script, or returns None so callers ask Gemini per request."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError:
+        print(f"Content pool '{path}' is not valid JSON. Generating sentences on demand.")
+        return None
+    if data.get('version') != POOL_VERSION:
+        print(f"Content pool '{path}' has an unsupported version. Rebuild it with 'python content_pool.py'.")
+        return None
+    return ContentPool(data)
+
+
+def merge_entries(pool_words, entries):
+    """Adds new sentences to the pool without duplicating ones it already has."""
+    for word, entry in entries.items():
+        existing = pool_words.setdefault(word, {"examples": [], "sentences": []})
+        for key in ('examples', 'sentences'):
+            existing[key].extend(s for s in entry[key] if s not in existing[key])
+
+
+def _create_model():
+    api_key = os.environ.get("GOOGLE_API_KEY")
+    if not api_key:
+        raise EnvironmentError("GOOGLE_API_KEY environment variable not set.")
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    json_mode_config = genai.GenerationConfig(response_mime_type="application/json")
+    return genai.GenerativeModel('gemini-1.5-flash-latest', generation_config=json_mode_config)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate example and fill-in-the-blank sentences with batched Gemini calls.")
+    parser.add_argument('--from-db', action='store_true', help="Read the word list from the MySQL 'words' table instead of the CSV.")
+    parser.add_argument('--csv', default=INPUT_CSV_FILE, help=f"Source CSV file (default: {INPUT_CSV_FILE}).")
+    parser.add_argument('--output', default=CONTENT_POOL_FILE, help=f"Pool file to update (default: {CONTENT_POOL_FILE}).")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f"Words per model call (default: {BATCH_SIZE}).")
+    parser.add_argument('--limit', type=int, help="Only generate for this many words.")
+    parser.add_argument('--refresh', action='store_true', help="Also add sentences for words already in the pool.")
+    args = parser.parse_args()
+
+    load_dotenv()
+    try:
+        with open(args.output, 'r', encoding='utf-8') as f:
+            pool = json.load(f)
+    except FileNotFoundError:
+        pool = {"version": POOL_VERSION, "words": {}}
+
+    words = [w['word'] for w in (read_words_from_db() if args.from_db else read_words_from_csv(args.csv)) if w['word']]
+    if not args.refresh:
+        words = [word for word in words if word not in pool['words']]
+    words = words[:args.limit] if args.limit else words
+    if not words:
+        print("Every word already has pooled content. Use --refresh to add more.")
+        return
+
+    model = _create_model()
+    stats = GenerationStats()
+    start = time.perf_counter()
+    print(f"Generating content for {len(words)} words in batches of {args.batch_size}...")
+    all_failed = []
+    for entries, failed in generate_content(model, words, args.batch_size, stats=stats):
+        merge_entries(pool['words'], entries)
+        all_failed.extend(failed)
+        # Saved after every batch so an interrupted run keeps what it has.
+        with open(args.output, mode='w', encoding='utf-8') as f:
+            json.dump(pool, f, indent=1, sort_keys=True)
+        print(f"  {len(entries)} words added, {len(failed)} failed")
+
+    print(f"Done in {time.perf_counter() - start:.1f} s: {stats.calls} model calls "
+          f"({stats.retries} single-word retries), {stats.prompt_tokens or stats.prompt_chars // 4} prompt tokens"
+          f"{'' if stats.prompt_tokens else ' (estimated)'}.")
+    if all_failed:
+        print(f"No valid content for: {', '.join(all_failed)}")
+    print(f"Pool '{args.output}' now covers {len(pool['words'])} words. Restart the app to load it.")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ OUTPUT_JSON_FILE = 'gre_words.json'
 def convert_csv_to_json():
     """
     Reads a CSV file with GRE words and converts it into a JSON database.
-    Assumes the CSV has columns: 'word', 'definition', 'sentence'.
+    Assumes the CSV has columns: 'word', 'definition', 'part of speech', 'sentence'.
     """
     word_database = []
     print(f"Reading from '{INPUT_CSV_FILE}'...")
@@ -27,6 +27,7 @@ def convert_csv_to_json():
                 word_entry = {
                     "word": row.get('word', '').strip(),
                     "definition": row.get('definition', '').strip(),
+                    "part_of_speech": row.get('part of speech', '').strip(),
                     "example": row.get('sentence', '').strip(),
                     # We can assign a default difficulty level here.
                     "difficulty": "uncommon" 
@@ -0,0 +1,222 @@
+import os
+import re
+import csv
+import json
+import math
+import random
+import argparse
+from collections import defaultdict
+
+# --- Configuration ---
+INPUT_CSV_FILE = 'magoosh_1000.csv'
+DISTRACTOR_INDEX_FILE = os.environ.get('DISTRACTOR_INDEX_FILE', 'distractor_index.json')
+# How many neighbors to keep per word; questions sample 3 of them.
+NEIGHBORS_PER_WORD = 8
+# Neighbors more similar than this are likely synonyms, which would make the
+# question ambiguous rather than hard, so they are skipped.
+MAX_SIMILARITY = 0.5
+INDEX_VERSION = 1
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'into',
+    'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'their', 'this', 'to', 'was', 'which',
+    'with', 'someone', 'something', 'one', 'who', 'not', 'very', 'especially', 'often', 'such',
+    'being', 'having', 'way', 'used', 'make', 'made',
+}
+TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+
+def _tokenize(text):
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if len(token) < 3 or token in STOPWORDS:
+            continue
+        # A very light stemmer is enough to match "deceive"/"deceiving"/"deceived".
+        for suffix in ('ing', 'ed', 'es', 's', 'ly'):
+            if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+                token = token[:-len(suffix)]
+                break
+        tokens.append(token)
+    return tokens
+
+
+def _tfidf_vectors(definitions):
+    """Returns one L2-normalised {term: weight} dict per definition."""
+    term_counts = [defaultdict(int) for _ in definitions]
+    document_frequency = defaultdict(int)
+    for counts, definition in zip(term_counts, definitions):
+        for token in _tokenize(definition):
+            counts[token] += 1
+        for token in counts:
+            document_frequency[token] += 1
+
+    num_docs = len(definitions)
+    vectors = []
+    for counts in term_counts:
+        vector = {
+            term: (1 + math.log(count)) * math.log((1 + num_docs) / (1 + document_frequency[term]))
+            for term, count in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        vectors.append({term: weight / norm for term, weight in vector.items()})
+    return vectors
+
+
+def build_distractor_index(words, neighbors_per_word=NEIGHBORS_PER_WORD, max_similarity=MAX_SIMILARITY, seed=0):
+    """
+    Builds the neighbor index for a list of {'word', 'definition', 'part_of_speech'} dicts.
+
+    Candidates with the same part of speech always rank ahead of the rest, then by
+    TF-IDF cosine similarity of their definitions. Words without enough similar
+    neighbors are topped up with random words of the same part of speech, so every
+    entry has `neighbors_per_word` distractors.
+
+    The CSV lists a word once per sense; only the first sense is kept, matching the
+    row migrate_to_mysql.py stores, so a word never becomes its own distractor.
+    """
+    rng = random.Random(seed)
+    first_senses = {}
+    for w in words:
+        if w.get('word') and w.get('definition'):
+            first_senses.setdefault(w['word'], w)
+    words = list(first_senses.values())
+    definitions = [w['definition'] for w in words]
+    vectors = _tfidf_vectors(definitions)
+
+    # Inverted index so each word is only compared with words sharing a term.
+    postings = defaultdict(list)
+    for doc_id, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings[term].append((doc_id, weight))
+
+    by_part_of_speech = defaultdict(list)
+    for doc_id, w in enumerate(words):
+        by_part_of_speech[w.get('part_of_speech') or ''].append(doc_id)
+
+    index = {}
+    for doc_id, w in enumerate(words):
+        scores = defaultdict(float)
+        for term, weight in vectors[doc_id].items():
+            for other_id, other_weight in postings[term]:
+                scores[other_id] += weight * other_weight
+
+        part_of_speech = w.get('part_of_speech') or ''
+        candidates = [
+            other_id for other_id, score in scores.items()
+            if words[other_id]['word'] != w['word'] and score <= max_similarity
+            and definitions[other_id] != definitions[doc_id]
+        ]
+        candidates.sort(key=lambda other_id: (
+            (words[other_id].get('part_of_speech') or '') != part_of_speech,
+            -scores[other_id],
+        ))
+        neighbors = candidates[:neighbors_per_word]
+
+        if len(neighbors) < neighbors_per_word:
+            chosen = set(neighbors) | {doc_id}
+            pool = [other_id for other_id in by_part_of_speech[part_of_speech]
+                    if other_id not in chosen and words[other_id]['word'] != w['word']
+                    and definitions[other_id] != definitions[doc_id]]
+            rng.shuffle(pool)
+            neighbors += pool[:neighbors_per_word - len(neighbors)]
+
+        index[w['word']] = {
+            "definition": w['definition'],
+            "part_of_speech": part_of_speech,
+            "neighbors": [words[other_id]['word'] for other_id in neighbors],
+        }
+
+    return {"version": INDEX_VERSION, "neighbors_per_word": neighbors_per_word, "words": index}
+
+
+class DistractorIndex:
+    """Read-only view over a built index; every lookup is a dict access."""
+
+    def __init__(self, data):
+        self.words = data['words']
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def pick_distractors(self, word, count=3):
+        """Returns `count` plausible distractor words for `word`, or [] if the word is not indexed."""
+        entry = self.words.get(word)
+        if not entry or len(entry['neighbors']) < count:
+            return []
+        return random.sample(entry['neighbors'], count)
+
+    def pick_distractor_definitions(self, word, count=3):
+        return [self.words[neighbor]['definition'] for neighbor in self.pick_distractors(word, count)]
+
+
+def load_distractor_index(path=DISTRACTOR_INDEX_FILE):
+    """Loads the prebuilt index, or returns None so callers fall back to random distractors."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"Distractor index '{path}' not found. Falling back to random distractors.")
+        return None
+    except json.JSONDecodeError:
+        print(f"Distractor index '{path}' is not valid JSON. Falling back to random distractors.")
+        return None
+    if data.get('version') != INDEX_VERSION:
+        print(f"Distractor index '{path}' has an unsupported version. Rebuild it with 'python distractor_index.py'.")
+        return None
+    return DistractorIndex(data)
+
+
+def read_words_from_csv(path=INPUT_CSV_FILE):
+    with open(path, mode='r', encoding='utf-8') as csv_file:
+        return [
+            {
+                "word": row.get('word', '').strip(),
+                "definition": row.get('definition', '').strip(),
+                "part_of_speech": row.get('part of speech', '').strip(),
+            }
+            for row in csv.DictReader(csv_file)
+        ]
+
+
+def read_words_from_db():
+    from dotenv import load_dotenv
+    import mysql.connector
+
+    load_dotenv()
+    conn = mysql.connector.connect(
+        host=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_HOST'),
+        user=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_USER'),
+        password=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_PW'),
+        port=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_PORT'),
+        database=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_DBNAME')
+    )
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT word, definition, part_of_speech FROM words")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build (or refresh) the distractor neighbor index.")
+    parser.add_argument('--from-db', action='store_true', help="Read the word list from the MySQL 'words' table instead of the CSV.")
+    parser.add_argument('--csv', default=INPUT_CSV_FILE, help=f"Source CSV file (default: {INPUT_CSV_FILE}).")
+    parser.add_argument('--output', default=DISTRACTOR_INDEX_FILE, help=f"Index file to write (default: {DISTRACTOR_INDEX_FILE}).")
+    args = parser.parse_args()
+
+    words = read_words_from_db() if args.from_db else read_words_from_csv(args.csv)
+    print(f"Building distractor index for {len(words)} words...")
+    index = build_distractor_index(words)
+
+    with open(args.output, mode='w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    print(f"Wrote {len(index['words'])} entries to '{args.output}'. Restart the app to load it.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+Gunicorn settings, picked up automatically by `gunicorn app:app`.
+
+The app is imported once in the master (preload_app) and workers are forked
+from it, so each worker starts without re-importing Flask, mysql-connector or
+the distractor index. The Gemini model object is also built in the master:
+creating it opens no network connections (the client is created on the first
+call inside each worker), so it is safe to share across fork.
+Bind address and worker count keep gunicorn's defaults ($PORT, $WEB_CONCURRENCY).
+"""
+preload_app = True
+
+
+def when_ready(server):
+    import app
+    app.get_model()
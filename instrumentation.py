@@ -0,0 +1,143 @@
+"""
+Hook points for timing database and Gemini calls.
+
+app.py routes every MySQL connection through instrumented_connect() and every
+model call through call_model() (or stream_model()). When no listener is registered (the default)
+both hand back the plain objects, so instrumentation costs one list check.
+Subsystems such as metrics.py subscribe by appending to the listener lists:
+
+    connect_listeners: fn(seconds, error)
+    query_listeners:   fn(conn, operation, params, seconds, error)
+    model_listeners:   fn(prompt, seconds, error)
+
+The `conn` passed to query listeners is the InstrumentedConnection, whose
+`connect_kwargs` are the settings it was opened with (which server ran it).
+"""
+import re
+import time
+
+connect_listeners = []
+query_listeners = []
+model_listeners = []
+
+TABLE_PATTERN = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+`?(\w+)", re.IGNORECASE)
+
+
+def statement_label(operation):
+    """
+    Reduces a SQL statement to a short, low-cardinality label such as
+    'SELECT words' or 'INSERT user_progress', suitable for metric labels.
+    """
+    operation = operation.strip()
+    verb = operation.split(None, 1)[0].upper() if operation else 'UNKNOWN'
+    table = TABLE_PATTERN.search(operation)
+    return f"{verb} {table.group(1)}" if table else verb
+
+
+def _notify(listeners, *args):
+    for listener in listeners:
+        try:
+            listener(*args)
+        except Exception as e:
+            print(f"Instrumentation listener failed: {e}")
+
+
+class InstrumentedCursor:
+    """Wraps a mysql.connector cursor and reports each execute() to query_listeners."""
+
+    def __init__(self, cursor, connection):
+        self._cursor = cursor
+        self._connection = connection
+
+    def _timed(self, method, operation, params, *args, **kwargs):
+        start = time.perf_counter()
+        error = False
+        try:
+            return method(operation, params, *args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            _notify(query_listeners, self._connection, operation, params, time.perf_counter() - start, error)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._timed(self._cursor.execute, operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._timed(self._cursor.executemany, operation, seq_params, *args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """Wraps a mysql.connector connection so that its cursors are instrumented."""
+
+    def __init__(self, connection, connect_kwargs=None):
+        self._connection = connection
+        self.connect_kwargs = connect_kwargs
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def instrumented_connect(connect, **kwargs):
+    """Calls `connect(**kwargs)`, timing it and wrapping the result if anyone is listening."""
+    if not (connect_listeners or query_listeners):
+        return connect(**kwargs)
+
+    start = time.perf_counter()
+    error = False
+    try:
+        conn = connect(**kwargs)
+    except Exception:
+        error = True
+        raise
+    finally:
+        _notify(connect_listeners, time.perf_counter() - start, error)
+    return InstrumentedConnection(conn, kwargs) if query_listeners else conn
+
+
+def call_model(model, prompt, **kwargs):
+    """Calls model.generate_content(prompt), reporting latency and failures to model_listeners."""
+    if not model_listeners:
+        return model.generate_content(prompt, **kwargs)
+
+    start = time.perf_counter()
+    error = False
+    try:
+        return model.generate_content(prompt, **kwargs)
+    except Exception:
+        error = True
+        raise
+    finally:
+        _notify(model_listeners, prompt, time.perf_counter() - start, error)
+
+
+def stream_model(model, prompt, **kwargs):
+    """
+    Calls model.generate_content(prompt, stream=True) and yields the text of each
+    chunk. The whole stream is reported to model_listeners as one call.
+    """
+    start = time.perf_counter()
+    error = False
+    try:
+        for chunk in model.generate_content(prompt, stream=True, **kwargs):
+            try:
+                text = chunk.text
+            except ValueError:
+                # A chunk with no text part, e.g. one carrying only the finish reason.
+                continue
+            yield text
+    except Exception:
+        error = True
+        raise
+    finally:
+        if model_listeners:
+            _notify(model_listeners, prompt, time.perf_counter() - start, error)
@@ -0,0 +1,250 @@
+"""
+Global and per-cohort leaderboards built from incrementally maintained aggregates.
+
+Two tables (created by migrate_to_mysql.py) hold everything the leaderboard reads:
+  user_stats                one row per user: cohort, words mastered, current and
+                            best answer streak. Indexed on each ranked column (and
+                            cohort + column), so top-N is a short index scan.
+  leaderboard_score_counts  how many users hold each score on each board. A user's
+                            rank is 1 + the users with a higher score, a range sum
+                            over distinct scores that does not grow with the user count.
+
+submit_answer() calls record_answer() inside its own transaction, so the aggregates
+change together with user_progress and never need a scan of user_progress.
+
+Usage from the command line:
+    python leaderboard.py rebuild                      # recompute from user_progress
+    python leaderboard.py top [--metric streak] [--cohort NAME] [--limit 10]
+"""
+import os
+import argparse
+from dotenv import load_dotenv
+import mysql.connector
+
+# --- Configuration ---
+# A word counts as mastered once it reaches the 5-day review interval.
+MASTERED_LEVEL = 6
+# Leaderboard name -> user_stats column it ranks by.
+METRICS = {'mastered': 'words_mastered', 'streak': 'best_streak'}
+GLOBAL_BOARD = 'global'
+MAX_COHORT_LENGTH = 64
+MAX_LIMIT = 100
+
+
+def get_db_connection():
+    return mysql.connector.connect(
+        host=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_HOST'),
+        user=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_USER'),
+        password=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_PW'),
+        port=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_PORT'),
+        database=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_DBNAME')
+    )
+
+
+def _board(cohort):
+    return f'cohort:{cohort}' if cohort else GLOBAL_BOARD
+
+
+def _adjust_score_counts(cursor, cohort, changes):
+    """
+    Moves one user between score buckets on the global board and their cohort's.
+    `changes` is a list of (metric, old_score, new_score); None means "not counted yet".
+    """
+    rows = []
+    for metric, old_score, new_score in changes:
+        if old_score == new_score:
+            continue
+        for board in ([GLOBAL_BOARD, _board(cohort)] if cohort else [GLOBAL_BOARD]):
+            if old_score is not None:
+                rows.append((board, metric, old_score, -1))
+            if new_score is not None:
+                rows.append((board, metric, new_score, 1))
+    if not rows:
+        return
+    # Always lock bucket rows in key order so concurrent answers cannot deadlock.
+    rows.sort()
+    cursor.executemany("""
+        INSERT INTO leaderboard_score_counts (board, metric, score, users)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE users = users + VALUES(users)
+    """, rows)
+
+
+def ensure_user_stats(cursor, user_id, cohort=''):
+    """Creates the user's stats row (counting their mastered words once) if it is missing."""
+    cursor.execute(
+        "SELECT COUNT(*) AS mastered FROM user_progress WHERE user_id = %s AND mastery_level >= %s",
+        (user_id, MASTERED_LEVEL)
+    )
+    row = cursor.fetchone()
+    mastered = row['mastered'] if isinstance(row, dict) else row[0]
+    cursor.execute("""
+        INSERT IGNORE INTO user_stats (user_id, cohort, words_mastered, current_streak, best_streak, updated_at)
+        VALUES (%s, %s, %s, 0, 0, UTC_TIMESTAMP())
+    """, (user_id, cohort, mastered))
+    if cursor.rowcount == 1:
+        _adjust_score_counts(cursor, cohort, [('mastered', None, mastered), ('streak', None, 0)])
+
+
+def record_answer(cursor, user_id, old_level, new_level, is_correct):
+    """
+    Updates the user's aggregates for one answer. Call it inside the answer's
+    transaction, after locking the user_progress row that `old_level` was read
+    from (SELECT ... FOR UPDATE) and before updating it; the caller commits.
+    """
+    query = "SELECT cohort, words_mastered, current_streak, best_streak FROM user_stats WHERE user_id = %s FOR UPDATE"
+    cursor.execute(query, (user_id,))
+    stats = cursor.fetchone()
+    if stats is None:
+        # Users from before the leaderboard existed get their row on first answer.
+        ensure_user_stats(cursor, user_id)
+        cursor.execute(query, (user_id,))
+        stats = cursor.fetchone()
+    if not isinstance(stats, dict):
+        stats = dict(zip(('cohort', 'words_mastered', 'current_streak', 'best_streak'), stats))
+
+    words_mastered = stats['words_mastered'] + (new_level >= MASTERED_LEVEL) - (old_level >= MASTERED_LEVEL)
+    current_streak = stats['current_streak'] + 1 if is_correct else 0
+    best_streak = max(stats['best_streak'], current_streak)
+
+    cursor.execute("""
+        UPDATE user_stats
+        SET words_mastered = %s, current_streak = %s, best_streak = %s, updated_at = UTC_TIMESTAMP()
+        WHERE user_id = %s
+    """, (words_mastered, current_streak, best_streak, user_id))
+    _adjust_score_counts(cursor, stats['cohort'], [
+        ('mastered', stats['words_mastered'], words_mastered),
+        ('streak', stats['best_streak'], best_streak),
+    ])
+
+
+def get_top(cursor, metric='mastered', cohort=None, limit=10):
+    """
+    The top `limit` users on a board, best first. Tied users share a rank.
+    Expects a dictionary cursor.
+    """
+    column = METRICS[metric]
+    where, params = ("WHERE s.cohort = %s", [cohort]) if cohort else ("", [])
+    cursor.execute(f"""
+        SELECT u.username, s.cohort, s.words_mastered, s.current_streak, s.best_streak, s.{column} AS score
+        FROM user_stats s
+        JOIN users u ON u.id = s.user_id
+        {where}
+        ORDER BY s.{column} DESC, s.user_id DESC
+        LIMIT %s
+    """, params + [limit])
+    rows = cursor.fetchall()
+    for position, row in enumerate(rows):
+        if position > 0 and row['score'] == rows[position - 1]['score']:
+            row['rank'] = rows[position - 1]['rank']
+        else:
+            row['rank'] = position + 1
+    return rows
+
+
+def get_board_size(cursor, metric='mastered', cohort=None):
+    """Number of users on a board. Expects a dictionary cursor."""
+    cursor.execute(
+        "SELECT COALESCE(SUM(users), 0) AS users FROM leaderboard_score_counts WHERE board = %s AND metric = %s",
+        (_board(cohort), metric)
+    )
+    return int(cursor.fetchone()['users'])
+
+
+def get_rank(cursor, user_id, metric='mastered', cohort=None):
+    """
+    The user's stats with their `rank` on a board, or None if they are not on it.
+    Expects a dictionary cursor.
+    """
+    cursor.execute(
+        "SELECT cohort, words_mastered, current_streak, best_streak FROM user_stats WHERE user_id = %s",
+        (user_id,)
+    )
+    stats = cursor.fetchone()
+    if stats is None or (cohort and stats['cohort'] != cohort):
+        return None
+    stats['score'] = stats[METRICS[metric]]
+    cursor.execute("""
+        SELECT COALESCE(SUM(users), 0) AS ahead
+        FROM leaderboard_score_counts
+        WHERE board = %s AND metric = %s AND score > %s
+    """, (_board(cohort), metric, stats['score']))
+    stats['rank'] = int(cursor.fetchone()['ahead']) + 1
+    return stats
+
+
+def rebuild_leaderboard(conn, recount_mastered=True):
+    """
+    Recomputes words mastered for every user from user_progress and rebuilds the
+    score counts. Streaks cannot be derived from user_progress, so existing ones are
+    kept. Scans all progress rows; run it after bulk imports or schema changes, not
+    on a schedule. With recount_mastered=False only the score counts are rebuilt
+    from user_stats. Returns the number of users on the global board.
+    """
+    cursor = conn.cursor()
+    try:
+        if recount_mastered:
+            cursor.execute("""
+                INSERT INTO user_stats (user_id, words_mastered, updated_at)
+                SELECT u.id, COUNT(up.word_id), UTC_TIMESTAMP()
+                FROM users u
+                LEFT JOIN user_progress up ON up.user_id = u.id AND up.mastery_level >= %s
+                GROUP BY u.id
+                ON DUPLICATE KEY UPDATE words_mastered = VALUES(words_mastered), updated_at = VALUES(updated_at)
+            """, (MASTERED_LEVEL,))
+        cursor.execute("DELETE FROM leaderboard_score_counts")
+        for metric, column in METRICS.items():
+            cursor.execute(f"""
+                INSERT INTO leaderboard_score_counts (board, metric, score, users)
+                SELECT %s, %s, {column}, COUNT(*) FROM user_stats GROUP BY {column}
+            """, (GLOBAL_BOARD, metric))
+            cursor.execute(f"""
+                INSERT INTO leaderboard_score_counts (board, metric, score, users)
+                SELECT CONCAT('cohort:', cohort), %s, {column}, COUNT(*)
+                FROM user_stats WHERE cohort <> '' GROUP BY cohort, {column}
+            """, (metric,))
+        cursor.execute("SELECT COUNT(*) FROM user_stats")
+        users = cursor.fetchone()[0]
+        conn.commit()
+        return users
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or print the vocabulary leaderboards.")
+    parser.add_argument('command', choices=['rebuild', 'top'])
+    parser.add_argument('--metric', choices=sorted(METRICS), default='mastered', help="Board to print (default: mastered).")
+    parser.add_argument('--cohort', help="Print a cohort's board instead of the global one.")
+    parser.add_argument('--limit', type=int, default=10, help="Number of users to print (default: 10).")
+    args = parser.parse_args()
+
+    load_dotenv()
+    try:
+        conn = get_db_connection()
+    except mysql.connector.Error as err:
+        print(f"FATAL ERROR: Failed to connect to MySQL database: {err}")
+        return
+
+    try:
+        if args.command == 'rebuild':
+            users = rebuild_leaderboard(conn)
+            print(f"Rebuilt leaderboard aggregates for {users} users.")
+        else:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                board_size = get_board_size(cursor, args.metric, args.cohort)
+                print(f"Top {args.limit} by {args.metric} ({args.cohort or 'all users'}, {board_size} users):")
+                for row in get_top(cursor, args.metric, args.cohort, args.limit):
+                    print(f"  {row['rank']:>4}. {row['username']:<24} {row['score']}")
+            finally:
+                cursor.close()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Enabled by setting METRICS_ENABLED=1. When it is unset nothing is registered:
+no request hooks, no DB or model listeners, and /metrics returns 404, so the
+quiz routes run exactly as before.
+
+Each gunicorn worker keeps its own registry, so a scrape reports the worker
+that served it. Every series carries that worker's `pid` label, so series from
+different workers never mix; sum over `pid` (e.g. `sum without (pid) (rate(...))`)
+for app-wide numbers.
+"""
+import os
+import time
+import bisect
+import threading
+from flask import g, request, has_request_context
+
+import instrumentation
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+
+# Latency buckets in seconds, from a fast cached read to a slow Gemini call.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labelnames, labelvalues, extra=(), const_labels=()):
+    pairs = list(const_labels) + list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self, const_labels=()):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labelvalues, value in sorted(self._values.items()):
+                labels = _format_labels(self.labelnames, labelvalues, const_labels=const_labels)
+                lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # labelvalues -> [per-bucket counts..., +Inf count, sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labelvalues)
+            if series is None:
+                series = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[position] += 1
+            series[-1] += value
+
+    def render(self, const_labels=()):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((labelvalues, list(series)) for labelvalues, series in self._values.items())
+        for labelvalues, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                labels = _format_labels(self.labelnames, labelvalues, [('le', _format_value(bound))], const_labels)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues, const_labels=const_labels)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    A gauge whose value is read from a callback at scrape time. With
+    metric_type='counter' it exposes a running total kept elsewhere instead.
+    """
+
+    def __init__(self, name, documentation, callback, metric_type='gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.metric_type = metric_type
+
+    def render(self, const_labels=()):
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"Error reading gauge {self.name}: {e}")
+            return []
+        if value is None:
+            return []
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}",
+                f"{self.name}{_format_labels((), (), const_labels=const_labels)} {_format_value(value)}"]
+
+
+# --- Metric definitions ---
+http_request_seconds = Histogram(
+    'gre_http_request_duration_seconds', 'Latency of HTTP requests by route.', ('route', 'method', 'status'))
+db_connect_seconds = Histogram(
+    'gre_db_connect_duration_seconds', 'Time spent opening MySQL connections.')
+db_connect_errors = Counter(
+    'gre_db_connect_errors_total', 'MySQL connections that failed to open.')
+db_connections = Counter(
+    'gre_db_connections_total', 'MySQL connections opened, by primary or replica.', ('role',))
+db_query_seconds = Histogram(
+    'gre_db_query_duration_seconds', 'Latency of SQL statements by route and statement.', ('route', 'statement'))
+db_query_errors = Counter(
+    'gre_db_query_errors_total', 'SQL statements that raised an error.', ('route', 'statement'))
+model_call_seconds = Histogram(
+    'gre_gemini_call_duration_seconds', 'Latency of Gemini generate_content calls by route.', ('route',))
+model_call_errors = Counter(
+    'gre_gemini_call_errors_total', 'Gemini generate_content calls that raised an error.', ('route',))
+
+_registry = [http_request_seconds, db_connect_seconds, db_connect_errors, db_connections,
+             db_query_seconds, db_query_errors, model_call_seconds, model_call_errors]
+_registry_lock = threading.Lock()
+
+
+def register_gauge(name, documentation, callback):
+    """
+    Exposes `callback()` as a gauge, e.g. a cache size or a pool's free slots.
+    Safe to call when metrics are disabled; the callback is then never invoked.
+    """
+    with _registry_lock:
+        _registry.append(Gauge(name, documentation, callback))
+
+
+def register_counter(name, documentation, callback):
+    """
+    Exposes `callback()` as a counter: a total that only grows while the worker
+    runs, such as cache hits, so rate() can handle worker restarts. Name it `..._total`.
+    """
+    with _registry_lock:
+        _registry.append(Gauge(name, documentation, callback, metric_type='counter'))
+
+
+def render_metrics():
+    lines = []
+    const_labels = (('pid', os.getpid()),)
+    with _registry_lock:
+        metrics = list(_registry)
+    for metric in metrics:
+        lines.extend(metric.render(const_labels))
+    lines.append("# HELP gre_process_info Worker serving this scrape.")
+    lines.append("# TYPE gre_process_info gauge")
+    lines.append(f'gre_process_info{{pid="{os.getpid()}"}} 1')
+    return '\n'.join(lines) + '\n'
+
+
+def count_db_connection(role):
+    if METRICS_ENABLED:
+        db_connections.inc(role)
+
+
+def _current_route():
+    if has_request_context() and request.url_rule is not None:
+        return request.url_rule.rule
+    return 'none'
+
+
+# --- Listeners for instrumentation.py ---
+def _on_connect(seconds, error):
+    db_connect_seconds.observe(seconds)
+    if error:
+        db_connect_errors.inc()
+
+
+def _on_query(conn, operation, params, seconds, error):
+    route, statement = _current_route(), instrumentation.statement_label(operation)
+    db_query_seconds.observe(seconds, route, statement)
+    if error:
+        db_query_errors.inc(route, statement)
+
+
+def _on_model_call(prompt, seconds, error):
+    route = _current_route()
+    model_call_seconds.observe(seconds, route)
+    if error:
+        model_call_errors.inc(route)
+
+
+def init_metrics(app):
+    """Registers request hooks and instrumentation listeners if METRICS_ENABLED is set."""
+    if not METRICS_ENABLED:
+        return False
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is None or request.url_rule is None or request.url_rule.rule == '/metrics':
+            return response
+        labels = (request.url_rule.rule, request.method, str(response.status_code))
+
+        def observe():
+            http_request_seconds.observe(time.perf_counter() - start, *labels)
+
+        # A streamed body (the SSE route) only runs after this hook, so time it until the server closes it.
+        if response.is_streamed:
+            response.call_on_close(observe)
+        else:
+            observe()
+        return response
+
+    instrumentation.connect_listeners.append(_on_connect)
+    instrumentation.query_listeners.append(_on_query)
+    instrumentation.model_listeners.append(_on_model_call)
+    print("Metrics enabled; scrape /metrics.")
+    return True
@@ -2,12 +2,120 @@ import os
 import json
 from dotenv import load_dotenv
 import mysql.connector
+from cache import get_cache
 
 # --- Configuration ---
 # The names of our source JSON files
 WORDS_JSON_FILE = 'gre_words.json'
 USERS_JSON_FILE = 'users.json'
 
+def create_tables(cursor):
+    """
+    Creates every table the app uses if it does not exist yet.
+    Shared by this migration and the benchmark setup in benchmarks/.
+    """
+    # Users Table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            username VARCHAR(255) UNIQUE NOT NULL
+        )
+    """)
+
+    # Words Table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS words (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            word VARCHAR(255) UNIQUE NOT NULL,
+            definition TEXT,
+            example TEXT,
+            part_of_speech VARCHAR(32)
+        )
+    """)
+
+    # Older databases were created before part_of_speech existed
+    cursor.execute("SHOW COLUMNS FROM words LIKE 'part_of_speech'")
+    if not cursor.fetchone():
+        cursor.execute("ALTER TABLE words ADD COLUMN part_of_speech VARCHAR(32)")
+
+    # User Progress Table (linking users and words)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_progress (
+            user_id INT,
+            word_id INT,
+            mastery_level INT DEFAULT 0,
+            next_review_date DATETIME,
+            PRIMARY KEY (user_id, word_id),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Review Events Table (append-only answer history, never updated in place)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS review_events (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            word_id INT NOT NULL,
+            correct BOOLEAN NOT NULL,
+            latency_ms INT NULL,
+            answered_at DATETIME NOT NULL,
+            inserted_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            KEY idx_review_events_user (user_id, answered_at),
+            KEY idx_review_events_inserted (inserted_at)
+        )
+    """)
+
+    # Per-day, per-word difficulty aggregates built by rollup_review_events.py
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS word_difficulty_daily (
+            day DATE NOT NULL,
+            word_id INT NOT NULL,
+            attempts INT NOT NULL DEFAULT 0,
+            correct INT NOT NULL DEFAULT 0,
+            total_latency_ms BIGINT NOT NULL DEFAULT 0,
+            latency_samples INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, word_id)
+        )
+    """)
+
+    # Watermark so each rollup only reads events it has not seen yet
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS review_rollup_state (
+            name VARCHAR(64) PRIMARY KEY,
+            last_event_id BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+
+    # Per-user leaderboard aggregates, maintained by submit_answer (see leaderboard.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_stats (
+            user_id INT PRIMARY KEY,
+            cohort VARCHAR(64) NOT NULL DEFAULT '',
+            words_mastered INT NOT NULL DEFAULT 0,
+            current_streak INT NOT NULL DEFAULT 0,
+            best_streak INT NOT NULL DEFAULT 0,
+            updated_at DATETIME NULL,
+            KEY idx_user_stats_mastered (words_mastered, user_id),
+            KEY idx_user_stats_streak (best_streak, user_id),
+            KEY idx_user_stats_cohort_mastered (cohort, words_mastered, user_id),
+            KEY idx_user_stats_cohort_streak (cohort, best_streak, user_id),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+    # How many users hold each score, per board, so a rank is a short range sum
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS leaderboard_score_counts (
+            board VARCHAR(80) NOT NULL,
+            metric VARCHAR(16) NOT NULL,
+            score INT NOT NULL,
+            users INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (board, metric, score)
+        )
+    """)
+
+
 def migrate_to_mysql():
     """
     Connects directly to a pre-existing MySQL database, creates tables,
@@ -36,38 +144,9 @@ def migrate_to_mysql():
 
     # --- Step 2: Create the tables (The CREATE DATABASE step has been removed) ---
     try:
-        print("Creating tables: 'users', 'words', 'user_progress'...")
-        
-        # Users Table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                username VARCHAR(255) UNIQUE NOT NULL
-            )
-        """)
-        
-        # Words Table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS words (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                word VARCHAR(255) UNIQUE NOT NULL,
-                definition TEXT,
-                example TEXT
-            )
-        """)
+        print("Creating tables: 'users', 'words', 'user_progress', 'review_events', 'word_difficulty_daily', 'user_stats'...")
         
-        # User Progress Table (linking users and words)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS user_progress (
-                user_id INT,
-                word_id INT,
-                mastery_level INT DEFAULT 0,
-                next_review_date DATETIME,
-                PRIMARY KEY (user_id, word_id),
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE
-            )
-        """)
+        create_tables(cursor)
         db_connection.commit()
         print("Tables created successfully.")
     except mysql.connector.Error as err:
@@ -81,11 +160,23 @@ def migrate_to_mysql():
         with open(WORDS_JSON_FILE, 'r', encoding='utf-8') as f:
             words_data = json.load(f)
         
-        word_insert_query = "INSERT IGNORE INTO words (word, definition, example) VALUES (%s, %s, %s)"
+        # The JSON lists a word once per sense and only the first definition is kept,
+        # so the part of speech is taken only from the row with that definition.
+        word_insert_query = """
+            INSERT INTO words (word, definition, example, part_of_speech) VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE part_of_speech = IF(definition = VALUES(definition), VALUES(part_of_speech), part_of_speech)
+        """
         for word_item in words_data:
-            cursor.execute(word_insert_query, (word_item['word'], word_item['definition'], word_item.get('example', '')))
+            cursor.execute(word_insert_query, (word_item['word'], word_item['definition'], word_item.get('example', ''), word_item.get('part_of_speech') or None))
         db_connection.commit()
         print(f"Populated {len(words_data)} words.")
+        # Make every running app process reload the word bank. A cache outage must
+        # not stop the rest of the migration; the word bank then expires on its own.
+        try:
+            get_cache().invalidate('words')
+        except Exception as e:
+            print(f"Warning: could not invalidate the cached word bank ({e}). "
+                  f"Running apps will reload it within CACHE_TTL_SECONDS.")
 
         print("Populating 'users' and 'user_progress' tables...")
         with open(USERS_JSON_FILE, 'r', encoding='utf-8') as f:
@@ -0,0 +1,254 @@
+"""
+Opt-in per-request profiling and SQL / Gemini tracing.
+
+A request is profiled when either
+  * it carries an `X-Profile` header equal to PROFILE_TOKEN, or
+  * it is picked by random sampling at PROFILE_SAMPLE_RATE (0.0 - 1.0).
+If neither PROFILE_TOKEN nor PROFILE_SAMPLE_RATE is set, init_profiling()
+registers nothing and requests run exactly as before.
+
+For each profiled request these files are written to PROFILE_DIR:
+  <id>.prof        cProfile output (PROFILE_MODE=cprofile, the default);
+                   open with `python -m pstats` or snakeviz
+  <id>.folded      collapsed stacks (PROFILE_MODE=sample); open with
+                   speedscope or flamegraph.pl
+  <id>.trace.json  Chrome trace-event file with the request, every SQL
+                   statement and every Gemini call; open in Perfetto or
+                   chrome://tracing. Statements slower than
+                   PROFILE_SLOW_QUERY_MS include their EXPLAIN plan.
+The id is returned to the client in the `X-Profile-Id` response header.
+"""
+import os
+import sys
+import json
+import time
+import random
+import cProfile
+import tempfile
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from flask import g, request, has_request_context
+
+import instrumentation
+
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_MODE = os.environ.get('PROFILE_MODE', 'cprofile')
+# Kept outside the app directory, which Flask serves as static files.
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'gre-vocab-profiles'))
+PROFILE_SLOW_QUERY_MS = float(os.environ.get('PROFILE_SLOW_QUERY_MS', 100))
+# Interval between stack samples in PROFILE_MODE=sample.
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0.005))
+# Long prompts and parameter lists are cut to keep trace files readable.
+MAX_TRACE_TEXT = 500
+
+
+def _truncate(value):
+    text = value if isinstance(value, str) else repr(value)
+    return text if len(text) <= MAX_TRACE_TEXT else text[:MAX_TRACE_TEXT] + '...'
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, thread_id, interval=PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfileSession:
+    """Everything captured for one profiled request."""
+
+    def __init__(self, route):
+        self.route = route
+        self.profile_id = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{route.strip('/').replace('/', '_') or 'root'}-{os.getpid()}-{random.randrange(16**6):06x}"
+        self.start = time.perf_counter()
+        self.thread_id = threading.get_ident()
+        self.events = []
+        self.slow_statements = []
+        self.profiler = None
+        self.sampler = None
+
+    def begin(self):
+        if PROFILE_MODE != 'sample':
+            try:
+                self.profiler = cProfile.Profile()
+                self.profiler.enable()
+                return
+            except ValueError:
+                # Another request on this worker is already under cProfile.
+                self.profiler = None
+        self.sampler = StackSampler(self.thread_id)
+        self.sampler.start()
+
+    def end(self):
+        if self.profiler:
+            self.profiler.disable()
+        if self.sampler:
+            self.sampler.stop()
+
+    def add_span(self, name, category, seconds, args):
+        ended = time.perf_counter() - self.start
+        event = {
+            "name": name, "cat": category, "ph": "X",
+            "ts": round((ended - seconds) * 1e6), "dur": round(seconds * 1e6),
+            "pid": os.getpid(), "tid": self.thread_id, "args": args,
+        }
+        self.events.append(event)
+        return event
+
+
+def _explain(get_connection, slow_statements):
+    """
+    Runs EXPLAIN for slow statements once the route is done, on a separate
+    connection to the same server (primary or replica) that ran each of them.
+    """
+    by_server = []
+    for event, operation, params, settings in slow_statements:
+        for server, statements in by_server:
+            if server == settings:
+                statements.append((event, operation, params))
+                break
+        else:
+            by_server.append((settings, [(event, operation, params)]))
+
+    for settings, statements in by_server:
+        conn = get_connection(settings)
+        if conn is None:
+            for event, _, _ in statements:
+                event['args']['explain_error'] = "Could not connect to the server that ran this statement."
+            continue
+        cursor = conn.cursor(dictionary=True)
+        try:
+            for event, operation, params in statements:
+                try:
+                    cursor.execute(f"EXPLAIN {operation}", params)
+                    event['args']['explain'] = [{k: _truncate(v) if v is not None else None for k, v in row.items()}
+                                                for row in cursor.fetchall()]
+                except Exception as e:
+                    event['args']['explain_error'] = str(e)
+        finally:
+            cursor.close()
+            conn.close()
+
+
+def _current_session():
+    if has_request_context():
+        return g.get('profile_session')
+    return None
+
+
+def _on_query(conn, operation, params, seconds, error):
+    session = _current_session()
+    if session is None:
+        return
+    event = session.add_span(instrumentation.statement_label(operation), 'sql', seconds, {
+        "statement": _truncate(' '.join(operation.split())),
+        "params": _truncate(params),
+        "error": error,
+    })
+    first_word = operation.lstrip().split(None, 1)[0].upper() if operation.strip() else ''
+    if seconds * 1000 >= PROFILE_SLOW_QUERY_MS and first_word in ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE'):
+        session.slow_statements.append((event, operation, params, getattr(conn, 'connect_kwargs', None)))
+
+
+def _on_model_call(prompt, seconds, error):
+    session = _current_session()
+    if session is None:
+        return
+    session.add_span('gemini.generate_content', 'model', seconds, {"prompt": _truncate(prompt), "error": error})
+
+
+def _should_profile():
+    if PROFILE_TOKEN and request.headers.get('X-Profile') == PROFILE_TOKEN:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def init_profiling(app, get_connection):
+    """
+    Installs the profiling hooks on `app` if profiling is configured.
+    `get_connection(settings)` opens the extra connection used for EXPLAIN, to the
+    server described by a statement's connect settings (None if unknown).
+    """
+    if not (PROFILE_TOKEN or PROFILE_SAMPLE_RATE > 0):
+        return False
+
+    @app.before_request
+    def _start_profile():
+        if request.url_rule is None or not _should_profile():
+            return
+        session = ProfileSession(request.url_rule.rule)
+        g.profile_session = session
+        session.begin()
+
+    @app.after_request
+    def _finish_profile(response):
+        session = g.get('profile_session')
+        if session is None:
+            return response
+        span_name = f"{request.method} {session.route}"
+        span_args = {
+            "status": response.status_code,
+            "query_string": request.query_string.decode('utf-8', 'replace'),
+        }
+
+        def finish():
+            session.end()
+            session.add_span(span_name, 'request', time.perf_counter() - session.start, span_args)
+            if session.slow_statements:
+                _explain(get_connection, session.slow_statements)
+            try:
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                base = os.path.join(PROFILE_DIR, session.profile_id)
+                if session.profiler:
+                    session.profiler.dump_stats(base + '.prof')
+                if session.sampler:
+                    session.sampler.dump(base + '.folded')
+                with open(base + '.trace.json', 'w', encoding='utf-8') as f:
+                    json.dump({"traceEvents": session.events, "displayTimeUnit": "ms"}, f)
+            except OSError as e:
+                print(f"Error writing profile {session.profile_id}: {e}")
+
+        # The header goes out now; the files name this id once they are written.
+        response.headers['X-Profile-Id'] = session.profile_id
+        if response.is_streamed:
+            # The SSE body (and its Gemini call) runs after this hook, with g.profile_session
+            # still set, so the profile is finished when the server closes the response.
+            response.call_on_close(finish)
+        else:
+            g.pop('profile_session', None)
+            finish()
+        return response
+
+    instrumentation.query_listeners.append(_on_query)
+    instrumentation.model_listeners.append(_on_model_call)
+    print(f"Request profiling enabled; traces are written to '{PROFILE_DIR}'.")
+    return True
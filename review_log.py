@@ -0,0 +1,15 @@
+INSERT_REVIEW_EVENT_QUERY = """
+    INSERT INTO review_events (user_id, word_id, correct, latency_ms, answered_at)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+def record_review_event(cursor, user_id, word_id, correct, latency_ms, answered_at):
+    """
+    Appends one answer to `review_events` using the answer's own cursor, so the
+    event commits (or rolls back) together with the user_progress update and is
+    never left in memory when a worker dies. `answered_at` is a UTC datetime.
+    """
+    cursor.execute(INSERT_REVIEW_EVENT_QUERY, (
+        user_id, word_id, bool(correct), latency_ms, answered_at.strftime('%Y-%m-%d %H:%M:%S')
+    ))
@@ -0,0 +1,132 @@
+import os
+import argparse
+from dotenv import load_dotenv
+import mysql.connector
+
+# --- Configuration ---
+ROLLUP_NAME = 'word_difficulty_daily'
+# Only roll up events inserted at least this long ago, so a batch that is still
+# being committed by a web worker is never skipped by the watermark.
+SETTLE_SECONDS = 60
+
+
+def get_db_connection():
+    return mysql.connector.connect(
+        host=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_HOST'),
+        user=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_USER'),
+        password=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_PW'),
+        port=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_PORT'),
+        database=os.environ.get('UCMAS_AWS_AD141_DB_ADMIN_DBNAME')
+    )
+
+
+def rollup_review_events(conn):
+    """
+    Folds review events newer than the stored watermark into word_difficulty_daily.
+    Safe to run as often as you like (e.g. from cron); each event is counted once.
+    Returns the number of events rolled up.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("INSERT IGNORE INTO review_rollup_state (name, last_event_id) VALUES (%s, 0)", (ROLLUP_NAME,))
+        cursor.execute("SELECT last_event_id FROM review_rollup_state WHERE name = %s FOR UPDATE", (ROLLUP_NAME,))
+        last_event_id = cursor.fetchone()[0]
+
+        cursor.execute(
+            "SELECT MAX(id) FROM review_events WHERE id > %s AND inserted_at < NOW() - INTERVAL %s SECOND",
+            (last_event_id, SETTLE_SECONDS)
+        )
+        upper_event_id = cursor.fetchone()[0]
+        if upper_event_id is None:
+            conn.commit()
+            return 0
+
+        cursor.execute("""
+            INSERT INTO word_difficulty_daily (day, word_id, attempts, correct, total_latency_ms, latency_samples)
+            SELECT DATE(answered_at), word_id, COUNT(*), SUM(correct), COALESCE(SUM(latency_ms), 0), COUNT(latency_ms)
+            FROM review_events
+            WHERE id > %s AND id <= %s
+            GROUP BY DATE(answered_at), word_id
+            ON DUPLICATE KEY UPDATE
+                attempts = attempts + VALUES(attempts),
+                correct = correct + VALUES(correct),
+                total_latency_ms = total_latency_ms + VALUES(total_latency_ms),
+                latency_samples = latency_samples + VALUES(latency_samples)
+        """, (last_event_id, upper_event_id))
+
+        cursor.execute(
+            "SELECT COUNT(*) FROM review_events WHERE id > %s AND id <= %s",
+            (last_event_id, upper_event_id)
+        )
+        rolled_up = cursor.fetchone()[0]
+
+        cursor.execute(
+            "UPDATE review_rollup_state SET last_event_id = %s WHERE name = %s",
+            (upper_event_id, ROLLUP_NAME)
+        )
+        conn.commit()
+        return rolled_up
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def get_hardest_words(conn, days=30, limit=20, min_attempts=5):
+    """
+    Returns the words with the lowest accuracy over the last `days` days.
+    Reads only the rollup table (and `words` for the text), never user_progress.
+    """
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT w.word, d.attempts, d.correct,
+                   1 - d.correct / d.attempts AS error_rate,
+                   d.total_latency_ms / NULLIF(d.latency_samples, 0) AS avg_latency_ms
+            FROM (
+                SELECT word_id, SUM(attempts) AS attempts, SUM(correct) AS correct,
+                       SUM(total_latency_ms) AS total_latency_ms, SUM(latency_samples) AS latency_samples
+                FROM word_difficulty_daily
+                WHERE day >= CURDATE() - INTERVAL %s DAY
+                GROUP BY word_id
+                HAVING SUM(attempts) >= %s
+            ) d
+            JOIN words w ON w.id = d.word_id
+            ORDER BY error_rate DESC, attempts DESC
+            LIMIT %s
+        """, (days, min_attempts, limit))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll up review_events into per-day, per-word difficulty aggregates.")
+    parser.add_argument('--report', action='store_true', help="Print the hardest words after rolling up.")
+    parser.add_argument('--days', type=int, default=30, help="Report window in days (default: 30).")
+    parser.add_argument('--limit', type=int, default=20, help="Number of words to report (default: 20).")
+    args = parser.parse_args()
+
+    load_dotenv()
+    try:
+        conn = get_db_connection()
+    except mysql.connector.Error as err:
+        print(f"FATAL ERROR: Failed to connect to MySQL database: {err}")
+        return
+
+    try:
+        rolled_up = rollup_review_events(conn)
+        print(f"Rolled up {rolled_up} review events.")
+
+        if args.report:
+            print(f"\nHardest words over the last {args.days} days:")
+            for row in get_hardest_words(conn, days=args.days, limit=args.limit):
+                latency = f"{row['avg_latency_ms']:.0f} ms" if row['avg_latency_ms'] is not None else "n/a"
+                print(f"  {row['word']:<20} {row['error_rate']:.0%} wrong over {row['attempts']} attempts, avg {latency}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
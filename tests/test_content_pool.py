@@ -0,0 +1,26 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from content_pool import validate_entry, _word_pattern
+
+
+def test_word_pattern_accepts_inflections():
+    for word, form in (('abate', 'abated'), ('abate', 'abating'), ('abet', 'abetted'),
+                       ('savvy', 'savvier'), ('gall', 'galls'), ('laconic', 'laconically')):
+        assert _word_pattern(word).search(f"They were {form} here."), (word, form)
+
+
+def test_word_pattern_rejects_longer_words():
+    for word, other in (('gall', 'gallery'), ('pan', 'pantry'), ('abate', 'abatement')):
+        assert not _word_pattern(word).search(f"The {other} was empty."), (word, other)
+
+
+def test_entry_without_the_word_is_rejected():
+    entry = {
+        "examples": ["The pan was hot.", "She put the pan away.", "The pantry was full."],
+        "blank_sentence": "He cooked the eggs in a _____.",
+    }
+    assert validate_entry('pan', entry) is None
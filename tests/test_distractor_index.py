@@ -0,0 +1,31 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from distractor_index import build_distractor_index, read_words_from_csv, load_distractor_index, INPUT_CSV_FILE
+
+
+def test_no_word_is_its_own_neighbor_in_built_index():
+    index = build_distractor_index(read_words_from_csv(os.path.join(ROOT, INPUT_CSV_FILE)))
+    for word, entry in index['words'].items():
+        assert word not in entry['neighbors'], word
+
+
+def test_no_word_is_its_own_neighbor_in_committed_index():
+    index = load_distractor_index(os.path.join(ROOT, 'distractor_index.json'))
+    for word, entry in index.words.items():
+        assert word not in entry['neighbors'], word
+
+
+def test_duplicate_senses_keep_the_first_definition():
+    words = [
+        {'word': 'glut', 'definition': 'an excessive supply.', 'part_of_speech': 'noun'},
+        {'word': 'glut', 'definition': 'supply with an excess of.', 'part_of_speech': 'verb'},
+        {'word': 'surfeit', 'definition': 'an excessive amount of something.', 'part_of_speech': 'noun'},
+        {'word': 'dearth', 'definition': 'a scarcity or lack of something.', 'part_of_speech': 'noun'},
+    ]
+    index = build_distractor_index(words, neighbors_per_word=2)
+    assert index['words']['glut']['definition'] == 'an excessive supply.'
+    assert 'glut' not in index['words']['glut']['neighbors']